@@ -0,0 +1,275 @@
+import argparse
+import collections
+import glob
+import inspect
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from Config_Manager import Config_Manager
+from Import_Functions import Import_Functions
+from Analysis_Functions import Analysis_Functions
+from Data_Manipulation_Functions import Data_Manipulation_Functions
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# LOGGING SETUP
+###############################################################################
+logger = logging.getLogger(__name__ + "_batch")
+logger.setLevel(logging.DEBUG)  # Master log level
+
+console_formatter = logging.Formatter("[%(levelname)s] %(name)s - %(message)s")
+file_formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s - %(message)s")
+
+console_handler = logging.StreamHandler()
+console_handler.setLevel(logging.INFO)
+console_handler.setFormatter(console_formatter)
+
+LOG_DIR = os.path.join(SCRIPT_DIR, "batch_functions.log")
+file_handler = logging.FileHandler(LOG_DIR, mode="a", encoding="utf-8")
+file_handler.setLevel(logging.DEBUG)
+file_handler.setFormatter(file_formatter)
+
+logger.addHandler(console_handler)
+logger.addHandler(file_handler)
+
+###############################################################################
+# PIPELINE STEPS
+# Each step calls the Analysis_Functions method of the same name with the
+# defaults from analysis_functions.<step> in the config, overridden by the
+# step's own params. Transform steps replace the data seen by later steps;
+# the other steps are reduced to a few scalars per column for the summary row.
+###############################################################################
+
+def _summarize_statistics(result, columns):
+    return {f"{col}_{stat}": float(result.loc[stat, col])
+            for col in columns for stat in ("mean", "std", "min", "max") if stat in result.index}
+
+def _summarize_spectrum(result, columns):
+    summary = {}
+    for col in columns:
+        freq, values = result[col]
+        # Skip the DC bin when there is anything else
+        k = int(np.argmax(values[1:])) + 1 if len(values) > 1 else 0
+        summary[f"{col}_peak_freq"] = float(freq[k])
+        summary[f"{col}_peak_value"] = float(values[k])
+    return summary
+
+def _summarize_peaks(result, columns):
+    return {f"{col}_num_peaks": len(result[col]["peaks"]) for col in columns}
+
+def _summarize_edges(result, columns):
+    return {f"{col}_num_rising": len(result[col]["rising"]) for col in columns}
+
+STEP_SUMMARIES = {
+    "descriptive_statistics": _summarize_statistics,
+    "analyze_fft": _summarize_spectrum,
+    "analyze_psd_welch": _summarize_spectrum,
+    "detect_peaks": _summarize_peaks,
+    "detect_edges": _summarize_edges,
+}
+TRANSFORM_STEPS = ("filter_data",)
+
+def _call_with_config(method, config: Config_Manager, key: str, args: tuple, params: dict):
+    """
+    Calls method(*args, **kwargs) with kwargs taken from the config section `key` (only names
+    the method accepts after the positional args), updated with params.
+    """
+    accepted = list(inspect.signature(method).parameters)[len(args):]
+    defaults = config.get(key) or {}
+    kwargs = {name: value for name, value in defaults.items() if name in accepted}
+    kwargs.update(params or {})
+    return method(*args, **kwargs)
+
+def _error_row(file_path: str, error: str) -> dict:
+    return {"file": file_path, "status": "error", "error": error, "rows": 0, "seconds": 0.0}
+
+def process_file(file_path: str, config_path: str) -> dict:
+    """
+    Imports one file and runs the batch_runner pipeline on it. Never raises: failures are
+    returned as a row with status 'error' so one bad file cannot stop the batch.
+
+    :param file_path: File to process.
+    :param config_path: YAML config with import_functions, analysis_functions and batch_runner sections.
+    :return: Summary row (file, status, error, rows, seconds, plus one entry per step output).
+    """
+    start = time.perf_counter()
+    row = {"file": file_path, "status": "ok", "error": "", "rows": 0}
+    try:
+        config = Config_Manager(config_path)
+        importer_name = config.get("batch_runner.importer", "import_csv")
+        importer = getattr(Import_Functions(), importer_name)
+        df = _call_with_config(importer, config, f"import_functions.{importer_name}", (file_path,), {})
+        if df is None or df.empty:
+            raise ValueError("no rows imported")
+        row["rows"] = len(df)
+
+        analyzer = Analysis_Functions()
+        # Steps without columns use every numeric column except the time axis
+        time_column = config.get("batch_runner.time_column")
+        numeric_columns = [col for col in df.select_dtypes(include="number").columns if col != time_column]
+        for step in config.get("batch_runner.pipeline", []):
+            name = step["step"]
+            if name not in STEP_SUMMARIES and name not in TRANSFORM_STEPS:
+                raise ValueError(f"Unknown pipeline step '{name}'; choose from "
+                                 f"{sorted(STEP_SUMMARIES) + list(TRANSFORM_STEPS)}.")
+            columns = step.get("columns") or numeric_columns
+            result = _call_with_config(getattr(analyzer, name), config, f"analysis_functions.{name}",
+                                       (df, columns), step.get("params"))
+            if name in TRANSFORM_STEPS:
+                df = result
+            else:
+                row.update({f"{name}.{k}": v for k, v in STEP_SUMMARIES[name](result, columns).items()})
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+###############################################################################
+# BATCH_RUNNER CLASS
+###############################################################################
+class Batch_Runner:
+    """
+    Runs the batch_runner pipeline of a YAML config over every file matching a glob and
+    collects one summary row per file.
+    """
+
+    def __init__(
+        self,
+        config_path: str,
+        pattern: str = None,
+        workers: int = None,
+        max_tasks_per_child: int = None,
+        summary_path: str = None
+    ):
+        """
+        :param config_path: YAML config (see batch_runner in Defaults_Config.yaml).
+        :param pattern: Glob of input files; overrides batch_runner.pattern.
+        :param workers: Worker processes; overrides batch_runner.workers.
+        :param max_tasks_per_child: Files a worker processes before it is replaced by a fresh
+                                    process, which returns its memory to the OS; overrides
+                                    batch_runner.max_tasks_per_child.
+        :param summary_path: CSV path for the summary table; overrides batch_runner.summary_path.
+        """
+        config = Config_Manager(config_path)
+        self.config_path = os.path.abspath(config_path)
+        self.pattern = pattern or config.get("batch_runner.pattern")
+        self.workers = workers or config.get("batch_runner.workers", 1)
+        self.max_tasks_per_child = max_tasks_per_child or config.get("batch_runner.max_tasks_per_child")
+        self.summary_path = summary_path or config.get("batch_runner.summary_path")
+
+    def run(self) -> pd.DataFrame:
+        """
+        Processes all files and returns the summary table (one row per file, sorted by name).
+
+        WHAT IT IS:
+            Files are handed to a process pool one at a time; each worker imports a file,
+            runs the pipeline, and sends back a single summary row, so at most `workers` files
+            are in memory at once. Progress, files/s and MB/s are logged after every file.
+
+        CAVEATS:
+            - A file that fails is reported with status 'error' and its message; the rest of
+              the batch continues. This includes a file whose worker process dies (crash,
+              out of memory): the unfinished files are resubmitted to a new pool, and a file
+              left unfinished by two broken pools is rerun alone to tell whether it is the cause.
+            - Worker recycling (max_tasks_per_child) uses the 'spawn' start method, so the
+              calling script needs an `if __name__ == "__main__":` guard.
+        """
+        files = sorted(glob.glob(self.pattern, recursive=True))
+        if not files:
+            logger.warning("No files match '%s'.", self.pattern)
+            return pd.DataFrame()
+        logger.info("Batch of %d files matching '%s' with %d worker(s).", len(files), self.pattern, self.workers)
+
+        start = time.perf_counter()
+        total_bytes = 0
+        rows = []
+        for done, row in enumerate(self._results(files), start=1):
+            rows.append(row)
+            total_bytes += os.path.getsize(row["file"]) if os.path.exists(row["file"]) else 0
+            elapsed = time.perf_counter() - start
+            rate = done / elapsed if elapsed > 0 else float("inf")
+            message = "[%d/%d] %s %s in %.2fs | %.2f files/s, %.1f MB/s, ETA %.0fs"
+            args = (done, len(files), row["status"], os.path.basename(row["file"]), row["seconds"],
+                    rate, total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0, (len(files) - done) / rate)
+            if row["status"] == "ok":
+                logger.info(message, *args)
+            else:
+                logger.error(message + " (%s)", *args, row["error"])
+
+        summary = pd.DataFrame(rows).sort_values("file").reset_index(drop=True)
+        failed = int((summary["status"] != "ok").sum())
+        logger.info("Batch complete: %d ok, %d failed in %.1fs.", len(summary) - failed, failed,
+                    time.perf_counter() - start)
+        if self.summary_path:
+            Data_Manipulation_Functions().export_csv(summary, self.summary_path)
+        return summary
+
+    def _results(self, files):
+        """
+        Yields summary rows in completion order, one per file.
+
+        A worker that dies breaks the whole pool, and every file still queued in it fails with
+        BrokenProcessPool. Those files are resubmitted, in their original order, to a new pool.
+        A file caught in two broken pools is rerun in a pool of its own, so only a file that
+        kills its own worker is reported as an error.
+        """
+        if self.workers <= 1:
+            for file_path in files:
+                yield process_file(file_path, self.config_path)
+            return
+        pending = list(files)
+        breaks = collections.Counter()
+        while pending:
+            unfinished = []
+            for file_path, row in self._pool_results(pending, self.workers):
+                if row is None:
+                    unfinished.append(file_path)
+                else:
+                    yield row
+            if unfinished:
+                logger.warning("A worker process died; resubmitting %d unfinished file(s).", len(unfinished))
+            breaks.update(unfinished)
+            unfinished = set(unfinished)
+            pending = [file_path for file_path in files if file_path in unfinished]
+            for file_path in [file_path for file_path in pending if breaks[file_path] >= 2]:
+                pending.remove(file_path)
+                [(_, row)] = self._pool_results([file_path], 1)
+                yield row or _error_row(file_path, "BrokenProcessPool: worker process died processing this file")
+
+    def _pool_results(self, files, workers):
+        """
+        Runs files in a new process pool and yields (file, row) as they complete; row is None
+        for files the pool could not finish because a worker died.
+        """
+        with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=self.max_tasks_per_child) as pool:
+            futures = {pool.submit(process_file, file_path, self.config_path): file_path for file_path in files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    yield file_path, future.result()
+                except BrokenProcessPool:
+                    yield file_path, None
+                except Exception as e:
+                    # process_file never raises, so this is a pickling/transport failure
+                    yield file_path, _error_row(file_path, f"{type(e).__name__}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the batch_runner pipeline over many files.")
+    parser.add_argument("config", nargs="?", default=os.path.join(SCRIPT_DIR, "Test_config.yaml"),
+                        help="YAML config with a batch_runner section.")
+    parser.add_argument("--pattern", help="Glob of input files, e.g. 'pulses/acq0*.csv'.")
+    parser.add_argument("--workers", type=int, help="Worker processes.")
+    parser.add_argument("--summary", help="CSV path for the summary table.")
+    args = parser.parse_args()
+
+    summary = Batch_Runner(args.config, args.pattern, args.workers, summary_path=args.summary).run()
+    print(summary.to_string())
+
+if __name__ == "__main__":
+    main()
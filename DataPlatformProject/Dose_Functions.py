@@ -0,0 +1,306 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from Segment_Functions import segment_bounds, segment_sums, segment_reduce, trapezoid_intervals
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+###############################################################################
+# LOGGING SETUP
+###############################################################################
+logger = logging.getLogger(__name__ + "_dose")
+logger.setLevel(logging.DEBUG)  # Master log level
+
+console_formatter = logging.Formatter("[%(levelname)s] %(name)s - %(message)s")
+file_formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(name)s - %(message)s")
+
+console_handler = logging.StreamHandler()
+console_handler.setLevel(logging.INFO)
+console_handler.setFormatter(console_formatter)
+
+LOG_DIR = os.path.join(SCRIPT_DIR, "dose_functions.log")
+file_handler = logging.FileHandler(LOG_DIR, mode="a", encoding="utf-8")
+file_handler.setLevel(logging.DEBUG)
+file_handler.setFormatter(file_formatter)
+
+logger.addHandler(console_handler)
+logger.addHandler(file_handler)
+
+###############################################################################
+# CONSTANTS
+###############################################################################
+C2K = 273.15                 # Add to degrees Celsius to get Kelvin
+ATM2PA = 101325              # [Pa/atm]
+GAS_CONSTANT = 8.314462618   # [m^3*Pa/K*mol]
+MOLAR_MASS = {"NO": 30.01, "NO2": 46.0055, "air": 28.9645}  # [g/mol]
+
+# Volts -> physical units for the NO analysis bench: output = (source - offset) * slope
+DEFAULT_CALIBRATION = {
+    "NO": {"source": "NO", "slope": 99.75, "offset": 0.12},          # ppm/volt, volt
+    "NO2": {"source": "NO2", "slope": 10.38, "offset": 0.016},       # ppm/volt, volt
+    "VolumeFlow": {"source": "Flow", "slope": 2.5, "offset": 1.0},   # LPM/volt, volt
+}
+
+###############################################################################
+# DOSE_FUNCTIONS CLASS
+###############################################################################
+class Dose_Functions:
+    """
+    A class for per-pulse NO/NO2 dose analysis: volt-to-ppm calibration, priming detection
+    and pulse integration, computed for all pulses of a file at once.
+    """
+
+    def __init__(
+        self,
+        calibration: dict = None,
+        temperature_c: float = 20.0,
+        pressure_atm: float = 1.0,
+        priming_volume_ml: float = 4.3
+    ):
+        """
+        :param calibration: Output column -> {'source', 'slope', 'offset'}; see DEFAULT_CALIBRATION.
+        :param temperature_c: Ambient temperature in degrees Celsius.
+        :param pressure_atm: Ambient pressure in atmospheres.
+        :param priming_volume_ml: Volume the device delivers before gas reaches the cannula end.
+        """
+        self.calibration = DEFAULT_CALIBRATION if calibration is None else calibration
+        self.temperature_c = temperature_c
+        self.pressure_atm = pressure_atm
+        self.priming_volume_ml = priming_volume_ml
+
+    @classmethod
+    def from_config(cls, config, key: str = "dose_functions", **overrides):
+        """
+        Builds the engine from the calibration/ambient/priming keys of a Config_Manager section.
+        Keyword overrides win.
+        """
+        params = {
+            "calibration": config.get(f"{key}.calibration"),
+            "temperature_c": config.get(f"{key}.ambient.temperature_c"),
+            "pressure_atm": config.get(f"{key}.ambient.pressure_atm"),
+            "priming_volume_ml": config.get(f"{key}.priming_volume_ml"),
+        }
+        params = {name: value for name, value in params.items() if value is not None}
+        params.update(overrides)
+        return cls(**params)
+
+    def molar_density(self) -> float:
+        """
+        Molar density of the gas at ambient conditions (ideal gas law), in mol/L.
+        """
+        return (self.pressure_atm * ATM2PA) / (GAS_CONSTANT * (C2K + self.temperature_c)) / 1000
+
+    def calibrate(self, df: pd.DataFrame, keep_volts: bool = True) -> pd.DataFrame:
+        """
+        Converts raw voltage columns to physical units.
+
+        WHAT IT IS:
+            Applies output = (source - offset) * slope for every entry of the calibration.
+
+        WHAT IT'S GOOD FOR:
+            - Turning oscilloscope captures (Flow, NO, NO2 in volts) into LPM and ppm.
+
+        CAVEATS:
+            - When an output column replaces its source (NO -> NO), the volts are kept as
+              '<source>_volt' if keep_volts is True.
+
+        PARAMETERS:
+            df : pd.DataFrame
+                The DataFrame containing the raw voltages.
+            keep_volts : bool, default True
+                Keep overwritten source columns as '<source>_volt'.
+
+        RETURNS:
+            pd.DataFrame
+                A copy of df with the calibrated columns added.
+        """
+        df = df.copy()
+        for output, params in self.calibration.items():
+            source = params.get("source", output)
+            volts = df[source].astype(float)
+            if keep_volts and output == source:
+                df[f"{source}_volt"] = volts
+            df[output] = (volts - params.get("offset", 0.0)) * params.get("slope", 1.0)
+        logger.info("Calibrated columns: %s", list(self.calibration))
+        return df
+
+    def priming_end(
+        self,
+        df: pd.DataFrame,
+        starts,
+        time_column: str = "Time",
+        flow_column: str = "VolumeFlow"
+    ) -> np.ndarray:
+        """
+        Finds, for every flow start, the sample after the one at which the volume delivered
+        since that start exceeds the priming volume (the index the dose notebook reports).
+
+        WHAT IT IS:
+            The cumulative trapezoid volume of the flow is computed once; a sample k belongs
+            to start s when s <= k < next start, and is 'primed' when
+            volume[k] - volume[s] > priming volume. The first primed sample per start is
+            found with np.searchsorted, so no per-sample loop is needed, and k + 1 is returned.
+
+        CAVEATS:
+            - Starts whose priming does not complete before the next start get -1.
+            - Priming completed on the last sample returns len(df).
+            - Flow is in L/min and time in seconds.
+
+        PARAMETERS:
+            df : pd.DataFrame
+                Calibrated data.
+            starts : array-like
+                Sample indices where each flow pulse starts.
+            time_column : str, default 'Time'
+            flow_column : str, default 'VolumeFlow'
+
+        RETURNS:
+            np.ndarray
+                Priming end index per start (in the order given, at most len(df)), or -1.
+        """
+        starts = np.asarray(starts, dtype=np.intp)
+        n = len(df)
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.intp)
+        order = np.argsort(starts, kind="stable")
+        sorted_starts = starts[order]
+
+        volume = np.concatenate([[0.0], np.cumsum(trapezoid_intervals(
+            df[flow_column].to_numpy(dtype=np.float64) / 60, df[time_column].to_numpy(dtype=np.float64)))])
+        # Start each sample belongs to (samples before the first start belong to none)
+        owner = np.searchsorted(sorted_starts, np.arange(n), side="right") - 1
+        primed = np.flatnonzero((owner >= 0) &
+                                (volume - volume[sorted_starts[np.maximum(owner, 0)]] > self.priming_volume_ml / 1000))
+        # Sentinel n: "not primed before the end of the record"
+        primed = np.append(primed, n)
+        ends = primed[np.searchsorted(primed, sorted_starts)]
+        limits = np.append(sorted_starts[1:], n)
+        # The notebook's loop stops one sample past the first primed one
+        ends = np.where(ends < limits, np.minimum(ends + 1, n), -1)
+
+        result = np.empty_like(ends)
+        result[order] = ends
+        logger.info("Priming end found for %d of %d starts.", int(np.sum(result >= 0)), len(result))
+        return result
+
+    def integrate_pulses(
+        self,
+        df: pd.DataFrame,
+        starts,
+        stops,
+        priming=None,
+        time_column: str = "Time",
+        flow_column: str = "VolumeFlow",
+        no_column: str = "NO",
+        no2_column: str = "NO2",
+        no_concentration: str = "median",
+        top_fraction: float = 0.8
+    ) -> pd.DataFrame:
+        """
+        Integrates volume, NO and NO2 for every pulse between its start and stop edges.
+
+        WHAT IT IS:
+            The per-interval trapezoid volumes (flow in L/min over time in s) and gas volumes
+            are computed once for the whole record; each pulse's totals are differences of
+            their cumulative sums, and the per-pulse NO peak comes from np.maximum.reduceat.
+            This handles tens of thousands of pulses in a few array passes.
+
+        WHAT IT'S GOOD FOR:
+            - Delivered pulse volume, NO/NO2 volume and mass per pulse (Dose Analysis).
+            - Feeding dose_summary for mean mass per pulse and mg/hr dose.
+
+        CAVEATS:
+            - Integration of pulse i runs over samples [start, stop - 1], as in the notebook.
+            - With priming given, a pulse starts at max(start, priming) (priming < 0 is ignored).
+            - no_concentration='median' uses the median of the NO plateau (samples above
+              top_fraction * max NO) for every pulse; 'measured' integrates flow * NO.
+            - Concentrations are in ppm; volumes are returned in mL (pulse) and L (gas).
+
+        PARAMETERS:
+            df : pd.DataFrame
+                Calibrated data (see calibrate).
+            starts, stops : array-like
+                Sample indices of each pulse's start and stop edge (same length).
+            priming : array-like, optional
+                Priming end index per pulse (see priming_end).
+            time_column, flow_column, no_column, no2_column : str
+                Column names; no2_column may be None.
+            no_concentration : {'median', 'measured'}, default 'median'
+            top_fraction : float, default 0.8
+                Plateau threshold for the median NO concentration.
+
+        RETURNS:
+            pd.DataFrame
+                One row per pulse with start, stop, duration, pulse_volume (mL), peak_NO,
+                volume_NO, mass_NO (mg) and, with NO2, volume_NO2, mass_NO2 (mg).
+        """
+        if no_concentration not in ("median", "measured"):
+            raise ValueError("no_concentration must be 'median' or 'measured'.")
+        n = len(df)
+        starts, stops = segment_bounds(starts, stops, n)
+        if priming is not None:
+            priming = np.asarray(priming, dtype=np.intp)
+            starts = np.where(priming >= 0, np.maximum(starts, priming), starts)
+
+        t = df[time_column].to_numpy(dtype=np.float64)
+        flow = df[flow_column].to_numpy(dtype=np.float64) / 60  # L/s
+        no = df[no_column].to_numpy(dtype=np.float64)
+        interval_volume = trapezoid_intervals(flow, t)  # L per sample interval
+        # Intervals [j, j + 1] for j in [start, stop - 1)
+        interval_stops = np.maximum(stops - 1, starts)
+
+        molar_density = self.molar_density()
+        pulse_volume = segment_sums(interval_volume, starts, interval_stops)
+        if no_concentration == "median":
+            no_top = no[no > np.max(no) * top_fraction]
+            volume_no = pulse_volume * np.median(no_top) * 1e-6
+        else:
+            volume_no = segment_sums(interval_volume * (no[1:] + no[:-1]) / 2 * 1e-6, starts, interval_stops)
+
+        result = pd.DataFrame({
+            "start": starts,
+            "stop": stops,
+            "duration": t[np.minimum(stops, n - 1)] - t[np.minimum(starts, n - 1)],
+            "pulse_volume": 1000 * pulse_volume,
+            "peak_NO": segment_reduce(np.maximum, no, starts, stops),
+            "volume_NO": volume_no,
+            "mass_NO": volume_no * molar_density * MOLAR_MASS["NO"] * 1000,
+        })
+        if no2_column is not None:
+            no2 = df[no2_column].to_numpy(dtype=np.float64)
+            volume_no2 = segment_sums(interval_volume * (no2[1:] + no2[:-1]) / 2 * 1e-6, starts, interval_stops)
+            result["volume_NO2"] = volume_no2
+            result["mass_NO2"] = volume_no2 * molar_density * MOLAR_MASS["NO2"] * 1000
+
+        logger.info("Integrated %d pulses over %d samples.", len(result), n)
+        return result
+
+    def dose_summary(self, pulses: pd.DataFrame, df: pd.DataFrame, time_column: str = "Time") -> dict:
+        """
+        Summarizes integrate_pulses output into breath rate, mean mass per pulse and dose.
+
+        CAVEATS:
+            - The breath rate uses the median interval between pulse starts, which is robust
+              to a single missed or extra pulse.
+
+        RETURNS:
+            dict with breath_rate (1/min), mean_pulse_volume (mL), mean_pulse_duration (s),
+            mean_mass_NO (mg), NO_dose (mg/hr) and, with NO2, mean_mass_NO2 (mg), NO2_dose (ug/hr).
+        """
+        if len(pulses) < 2:
+            raise ValueError("At least two pulses are needed to compute a breath rate.")
+        start_times = df[time_column].to_numpy(dtype=np.float64)[pulses["start"].to_numpy()]
+        breath_rate = float(60 / np.median(np.diff(start_times)))
+        summary = {
+            "breath_rate": breath_rate,
+            "mean_pulse_volume": float(pulses["pulse_volume"].mean()),
+            "mean_pulse_duration": float(pulses["duration"].mean()),
+            "mean_mass_NO": float(pulses["mass_NO"].mean()),
+            "NO_dose": float(pulses["mass_NO"].mean() * breath_rate * 60),
+        }
+        if "mass_NO2" in pulses:
+            summary["mean_mass_NO2"] = float(pulses["mass_NO2"].mean())
+            summary["NO2_dose"] = float(pulses["mass_NO2"].mean() * breath_rate * 60 * 1000)
+        logger.info("Dose summary: %s", summary)
+        return summary
@@ -0,0 +1,59 @@
+# edge_functions.py
+
+import numpy as np
+
+###############################################################################
+# VECTORIZED THRESHOLD CROSSINGS
+# A crossing detector with hysteresis is a two-state machine: the state goes high
+# once the signal rises above `high` and low once it falls below `low`; samples in
+# between keep the previous state. The state is built without a Python loop by
+# marking the samples that decide it, forward-filling their index with
+# np.maximum.accumulate, and reading the state of the last deciding sample. Edges
+# are then the indices where that state changes (np.flatnonzero of np.diff), and
+# events such as peaks are mapped to their surrounding edges with np.searchsorted.
+###############################################################################
+
+def hysteresis_state(signal: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Boolean array: True while the signal is 'high' (above `high`, and staying high until it
+    drops below `low`). Samples before the first decisive sample take that sample's state.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    above = signal > high
+    decisive = above | (signal < low)
+    if not decisive.any():
+        return np.zeros(len(signal), dtype=bool)
+    last = np.maximum.accumulate(np.where(decisive, np.arange(len(signal)), -1))
+    last[last < 0] = np.flatnonzero(decisive)[0]
+    return above[last]
+
+def crossings(signal: np.ndarray, low: float, high: float = None):
+    """
+    Returns (rising, falling): indices of the first sample of each high and low run.
+    With high=None (or high == low) this is a plain strict threshold crossing at `low`.
+    """
+    state = hysteresis_state(signal, low, low if high is None else high)
+    change = np.flatnonzero(state[1:] != state[:-1]) + 1
+    rising = change[state[change]]
+    falling = change[~state[change]]
+    return rising, falling
+
+def preceding_edge(edges: np.ndarray, events: np.ndarray) -> np.ndarray:
+    """
+    For each event index, the last edge strictly before it; -1 when there is none.
+    """
+    edges, events = np.asarray(edges), np.asarray(events)
+    if len(edges) == 0:
+        return np.full(len(events), -1, dtype=np.intp)
+    idx = np.searchsorted(edges, events, side="left") - 1
+    return np.where(idx >= 0, edges[np.maximum(idx, 0)], -1)
+
+def following_edge(edges: np.ndarray, events: np.ndarray) -> np.ndarray:
+    """
+    For each event index, the first edge strictly after it; -1 when there is none.
+    """
+    edges, events = np.asarray(edges), np.asarray(events)
+    if len(edges) == 0:
+        return np.full(len(events), -1, dtype=np.intp)
+    idx = np.searchsorted(edges, events, side="right")
+    return np.where(idx < len(edges), edges[np.minimum(idx, len(edges) - 1)], -1)
@@ -0,0 +1,112 @@
+# filter_functions.py
+
+import functools
+import numpy as np
+import pandas as pd
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+###############################################################################
+# FILTER DESIGN
+###############################################################################
+@functools.lru_cache(maxsize=64)
+def _design_butter_sos(filter_type: str, cutoff_freq, order: int, sampling_rate: float) -> np.ndarray:
+    nyquist = 0.5 * sampling_rate
+    normalized_cutoff = np.asarray(cutoff_freq) / nyquist
+    return butter(order, normalized_cutoff, btype=filter_type, analog=False, output="sos")
+
+def design_butter_sos(filter_type: str, cutoff_freq, order: int, sampling_rate: float) -> np.ndarray:
+    """
+    Butterworth filter in second-order-sections form, cached by (type, cutoff, order, fs).
+
+    :param filter_type: One of {'lowpass', 'highpass', 'bandpass', 'bandstop'}.
+    :param cutoff_freq: Cutoff in Hz; a (low, high) pair for bandpass/bandstop.
+    :param order: Filter order.
+    :param sampling_rate: Sampling rate in Hz.
+    :return: (n_sections, 6) array; a copy, so callers cannot alter the cached design.
+    """
+    if np.ndim(cutoff_freq):
+        cutoff_freq = tuple(float(f) for f in cutoff_freq)
+    else:
+        cutoff_freq = float(cutoff_freq)
+    return _design_butter_sos(filter_type, cutoff_freq, int(order), float(sampling_rate)).copy()
+
+###############################################################################
+# STREAMING (CAUSAL) FILTER
+###############################################################################
+class Streaming_Filter:
+    """
+    Causal Butterworth filter that keeps its state between chunks.
+
+    Each call to process() runs sosfilt on one chunk and carries the final state (zi) into the
+    next call, so filtering a recording chunk by chunk gives bit-identical output to one sosfilt
+    call on the concatenated signal. Any number of channels is filtered at once (one column per
+    channel). Unlike filter_data, this is single-pass (not zero-phase): there is phase delay,
+    but no look-ahead, which is what real-time or out-of-core pipelines need.
+    """
+
+    def __init__(
+        self,
+        filter_type: str = "lowpass",
+        cutoff_freq=1.0,
+        order: int = 4,
+        sampling_rate: float = 1.0,
+        initial: str = "zeros"
+    ):
+        """
+        :param filter_type: One of {'lowpass', 'highpass', 'bandpass', 'bandstop'}.
+        :param cutoff_freq: Cutoff in Hz; a (low, high) pair for bandpass/bandstop.
+        :param order: Filter order.
+        :param sampling_rate: Sampling rate in Hz.
+        :param initial: 'zeros' starts from rest (same as sosfilt without zi). 'steady' starts in
+                        the steady state for the first sample, which avoids a start-up transient
+                        on signals with a DC offset.
+        """
+        if initial not in ("zeros", "steady"):
+            raise ValueError("initial must be 'zeros' or 'steady'.")
+        self.sos = design_butter_sos(filter_type, cutoff_freq, order, sampling_rate)
+        self.initial = initial
+        self.zi = None
+        self.num_samples = 0
+
+    @classmethod
+    def from_config(cls, config, key: str = "analysis_functions.filter_data", **overrides):
+        """
+        Builds the filter from the filter_type/cutoff_freq/order/sampling_rate keys of a
+        Config_Manager section (the same keys filter_data uses). Keyword overrides win.
+        """
+        params = {name: config.get(f"{key}.{name}") for name in ("filter_type", "cutoff_freq", "order", "sampling_rate")}
+        params = {name: value for name, value in params.items() if value is not None}
+        params.update(overrides)
+        return cls(**params)
+
+    def reset(self):
+        """
+        Forgets the carried state; the next chunk starts a new recording.
+        """
+        self.zi = None
+        self.num_samples = 0
+
+    def process(self, chunk):
+        """
+        Filters the next chunk.
+
+        :param chunk: 1D array (one channel), 2D array of shape (samples, channels), or a
+                      DataFrame whose columns are the channels. The channel count must stay the
+                      same between calls.
+        :return: Filtered chunk of the same shape; a DataFrame with the same index and columns
+                 if a DataFrame was passed.
+        """
+        values = chunk.to_numpy(dtype=np.float64) if isinstance(chunk, pd.DataFrame) else np.asarray(chunk, dtype=np.float64)
+        if self.zi is None:
+            # State shape (sections, 2, channels...) for filtering along axis 0
+            self.zi = np.zeros((self.sos.shape[0], 2) + values.shape[1:])
+            if self.initial == "steady" and len(values):
+                self.zi = sosfilt_zi(self.sos).reshape((self.sos.shape[0], 2) + (1,) * (values.ndim - 1)) * values[0]
+        elif self.zi.shape[2:] != values.shape[1:]:
+            raise ValueError(f"Chunk has {values.shape[1:]} channels; this filter carries state for {self.zi.shape[2:]}.")
+
+        filtered, self.zi = sosfilt(self.sos, values, axis=0, zi=self.zi)
+        self.num_samples += len(values)
+        if isinstance(chunk, pd.DataFrame):
+            return pd.DataFrame(filtered, index=chunk.index, columns=chunk.columns)
+        return filtered
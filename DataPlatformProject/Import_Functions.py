@@ -85,6 +85,41 @@ class Import_Functions:
 
         return pd.DataFrame()
 
+    def import_csv_chunks(
+        self,
+        file_path: str,
+        chunksize: int = 100_000,
+        delimiter: str = ",",
+        usecols: Optional[List[str]] = None,
+        encoding: Optional[str] = None,
+        na_values: Optional[Union[List[str], str]] = None
+    ):
+        """
+        Reads a CSV file lazily as consecutive DataFrame chunks, for files too large for import_csv.
+
+        :param file_path: Path to the CSV file.
+        :param chunksize: Number of rows per chunk.
+        :param delimiter: Delimiter used in the CSV file (default is ',').
+        :param usecols: List of column names to parse from the CSV file (default is None).
+        :param encoding: Encoding of the CSV file (default is None, which uses system default).
+        :param na_values: Additional strings to recognize as NaN (default is None).
+        :return: Generator of pandas DataFrames with at most chunksize rows each.
+        """
+        logger.debug("Streaming CSV from: %s in chunks of %d rows", file_path, chunksize)
+        num_rows = 0
+        with pd.read_csv(
+            file_path,
+            sep=delimiter,
+            usecols=usecols,
+            encoding=encoding,
+            na_values=na_values,
+            chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                num_rows += len(chunk)
+                yield chunk
+        logger.info("CSV stream complete: '%s' (%d rows).", file_path, num_rows)
+
     def import_excel(
         self,
         file_path: str,
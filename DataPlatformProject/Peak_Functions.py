@@ -0,0 +1,156 @@
+# peak_functions.py
+
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.signal import find_peaks
+
+###############################################################################
+# CHUNKED PEAK DETECTION
+# find_peaks applies its conditions in the order local maxima -> height ->
+# threshold -> distance. The first three only look at a peak and its immediate
+# neighbours (plus the run of equal samples forming a flat peak), so they are
+# evaluated per chunk, in parallel. Chunk cuts are placed only where two
+# consecutive samples differ, so no flat peak is ever split, and each chunk is
+# given one extra sample on each side for the neighbour comparisons.
+# The distance condition can cascade across any number of peaks, so it is
+# applied once to the merged candidates, with the same priority order as
+# find_peaks. The result is identical to a single find_peaks call.
+###############################################################################
+
+def select_by_peak_distance(peaks: np.ndarray, priority: np.ndarray, distance: float) -> np.ndarray:
+    """
+    Boolean mask of the peaks kept by find_peaks' distance condition (highest priority first).
+    Same algorithm and tie order as SciPy's internal routine, which is not public API.
+    """
+    peaks = np.asarray(peaks)
+    distance = int(np.ceil(distance))
+    # A peak's neighbourhood [left, right) does not depend on which peaks were already removed
+    lefts = np.searchsorted(peaks, peaks - distance, side="right").tolist()
+    rights = np.searchsorted(peaks, peaks + distance, side="left").tolist()
+    keep = bytearray(b"\x01") * len(peaks)
+    for j in np.argsort(priority)[::-1].tolist():
+        if keep[j]:
+            left, right = lefts[j], rights[j]
+            if right - left > 1:
+                keep[left:right] = bytes(right - left)
+                keep[j] = 1
+    return np.frombuffer(keep, dtype=bool).copy()
+
+def segment_peaks(segment: np.ndarray, offset: int, core_start: int, core_end: int, height=None, threshold=None):
+    """
+    Runs find_peaks (height/threshold only) on one segment and keeps the peaks whose absolute
+    index lies in [core_start, core_end). Returns (peaks, properties, peak values) with
+    absolute indices; the values are the priority for the later distance condition.
+    """
+    peaks, properties = find_peaks(segment, height=height, threshold=threshold)
+    keep = (peaks + offset >= core_start) & (peaks + offset < core_end)
+    peaks = peaks[keep]
+    values = np.asarray(segment, dtype=np.float64)[peaks]
+    return peaks + offset, {key: prop[keep] for key, prop in properties.items()}, values
+
+def chunk_cuts(signal: np.ndarray, chunk_size: int) -> np.ndarray:
+    """
+    Chunk boundaries near multiples of chunk_size, moved forward so that signal[b - 1] != signal[b].
+    """
+    changes = np.flatnonzero(signal[1:] != signal[:-1]) + 1
+    nominal = np.arange(chunk_size, len(signal), chunk_size)
+    idx = np.searchsorted(changes, nominal)
+    cuts = changes[idx[idx < len(changes)]]
+    return np.unique(np.concatenate([[0], cuts, [len(signal)]]))
+
+def array_tasks(signal: np.ndarray, chunk_size: int, height=None, threshold=None):
+    """
+    Yields segment_peaks arguments covering an in-memory signal.
+    """
+    cuts = chunk_cuts(signal, chunk_size)
+    for core_start, core_end in zip(cuts[:-1], cuts[1:]):
+        lo, hi = max(core_start - 1, 0), min(core_end + 1, len(signal))
+        yield signal[lo:hi], lo, core_start, core_end, height, threshold
+
+class Stream_Splitter:
+    """
+    Turns a signal that arrives as consecutive 1D blocks into segment_peaks arguments.
+    Samples after the last safe cut (and one sample of left context) are carried into the
+    next block, so memory is bounded by the block size.
+    """
+
+    def __init__(self, height=None, threshold=None):
+        self.height = height
+        self.threshold = threshold
+        self.buffer = np.empty(0)
+        self.buffer_start = 0   # absolute index of buffer[0]
+        self.core_start = 0     # first absolute index not yet covered by a segment core
+
+    def push(self, block: np.ndarray):
+        """
+        Adds a block; returns the task for the newly completed stretch, or None.
+        """
+        self.buffer = np.concatenate([self.buffer, np.asarray(block, dtype=np.float64)])
+        # Last cut b (absolute) with signal[b - 1] != signal[b], leaving signal[b] as right context
+        changes = np.flatnonzero(self.buffer[1:] != self.buffer[:-1]) + 1 + self.buffer_start
+        changes = changes[changes > self.core_start]
+        if len(changes) == 0:
+            return None
+        core_end = int(changes[-1])
+        lo = max(self.core_start - 1, 0)
+        task = (self.buffer[lo - self.buffer_start:core_end + 1 - self.buffer_start], lo,
+                self.core_start, core_end, self.height, self.threshold)
+        self.buffer = self.buffer[core_end - 1 - self.buffer_start:]
+        self.buffer_start = core_end - 1
+        self.core_start = core_end
+        return task
+
+    def finish(self):
+        """
+        Returns the task for the remaining samples once the input is exhausted, or None.
+        """
+        end = self.buffer_start + len(self.buffer)
+        if end <= self.core_start:
+            return None
+        lo = max(self.core_start - 1, 0)
+        return (self.buffer[lo - self.buffer_start:], lo, self.core_start, end, self.height, self.threshold)
+
+def _run_segment(tagged_task):
+    tag, task = tagged_task
+    return tag, segment_peaks(*task)
+
+def run_tasks(tagged_tasks, workers: int = 1):
+    """
+    Runs segment_peaks over (tag, task) pairs, in parallel when workers > 1 with at most
+    2 * workers segments in flight, and yields (tag, result) in input order.
+    """
+    if workers <= 1:
+        for tagged_task in tagged_tasks:
+            yield _run_segment(tagged_task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for tagged_task in tagged_tasks:
+            pending.append(pool.submit(_run_segment, tagged_task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def merge_segment_peaks(results, distance=None):
+    """
+    Concatenates per-segment (peaks, properties, values) and applies the distance condition.
+    """
+    peak_parts, value_parts, property_parts = [], [], collections.defaultdict(list)
+    for peaks, properties, values in results:
+        peak_parts.append(peaks)
+        value_parts.append(values)
+        for key, prop_values in properties.items():
+            property_parts[key].append(prop_values)
+    peaks = np.concatenate(peak_parts) if peak_parts else np.empty(0, dtype=np.intp)
+    signal_values = np.concatenate(value_parts) if value_parts else np.empty(0)
+    properties = {key: np.concatenate(parts) for key, parts in property_parts.items()}
+
+    if distance is not None:
+        if distance < 1:
+            raise ValueError("`distance` must be greater or equal to 1")
+        keep = select_by_peak_distance(peaks, signal_values, distance)
+        peaks = peaks[keep]
+        properties = {key: values[keep] for key, values in properties.items()}
+    return peaks, properties
@@ -187,6 +187,83 @@ class Plotting_Functions:
         plt.close()
         logger.info("Scatter plot saved to '%s' (x_col='%s', y_col='%s').", save_path, x_col, y_col)
 
+    def plot_time_series(
+        self,
+        df: pd.DataFrame,
+        columns: list,
+        time_column: str = None,
+        save_path: str = "time_series.png",
+        title: str = "Time Series",
+        xlabel: str = None,
+        ylabel: str = None,
+        pyramid=None,
+        t_start: float = None,
+        t_end: float = None,
+        width_px: int = 2400
+    ):
+        """
+        Generates and saves a line plot of one or more columns over time.
+
+        WHAT IT IS:
+            A line plot of each column against the time column (or the sample index).
+
+        WHAT IT'S GOOD FOR:
+            - Looking at raw or filtered signals, and zooming into a time range.
+            - Long recordings, when given a Signal_Pyramid: only the coarsest level that still
+              has about two samples per horizontal pixel is drawn, so the plot takes the same
+              time for a minute or a day of data.
+
+        CAVEATS:
+            - Pyramid levels are low-pass filtered, so very short spikes are smoothed out in a
+              zoomed-out view; zoom in (t_start/t_end) to see them at full rate.
+
+        PARAMETERS:
+            df : pd.DataFrame
+                The DataFrame containing your data. Ignored when pyramid is given.
+            columns : list
+                The columns to plot.
+            time_column : str, optional
+                Column for the x-axis. If None, the pyramid's time column or the row index is used.
+            save_path : str, default "time_series.png"
+                File path where the plot will be saved.
+            title : str, default "Time Series"
+                Plot title.
+            xlabel : str, optional
+                Label for the x-axis. If None, defaults to time_column (or 'Sample').
+            ylabel : str, optional
+                Label for the y-axis.
+            pyramid : Signal_Pyramid, optional
+                Decimation pyramid (Analysis_Functions.build_pyramid) to draw from.
+            t_start, t_end : float, optional
+                Time range to plot (pyramid only).
+            width_px : int, default 2400
+                Horizontal resolution the level is chosen for (8 in at 300 dpi).
+
+        RETURNS:
+            None. The figure is saved to 'save_path'.
+        """
+        logger.debug("Starting plot_time_series with columns=%s, time_column=%s, pyramid=%s",
+                     columns, time_column, pyramid is not None)
+        if pyramid is not None:
+            df, rate = pyramid.select(pixels=width_px, t_start=t_start, t_end=t_end)
+            time_column = time_column or pyramid.time_column
+            logger.info("plot_time_series drawing %d samples per column from the %.4g Hz pyramid level.", len(df), rate)
+
+        x_data = df[time_column].values if time_column is not None else np.arange(len(df))
+
+        plt.figure(figsize=(8, 6))
+        for col in columns:
+            plt.plot(x_data, df[col].values, label=col, linewidth=0.8)
+        plt.title(title)
+        plt.xlabel(xlabel if xlabel else (time_column if time_column else "Sample"))
+        if ylabel:
+            plt.ylabel(ylabel)
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.close()
+        logger.info("Time series plot saved to '%s' (columns=%s).", save_path, columns)
+
     def plot_pie_chart(
         self,
         df: pd.DataFrame,
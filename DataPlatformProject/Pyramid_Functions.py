@@ -0,0 +1,138 @@
+# pyramid_functions.py
+
+import json
+import numpy as np
+import pandas as pd
+from scipy.signal import resample_poly
+
+###############################################################################
+# DECIMATION PYRAMID
+# Level 0 is the raw signal; level k is level k-1 low-pass filtered and downsampled
+# by 2 (scipy.signal.resample_poly), i.e. decimation by 2**k overall. All levels
+# together take less than twice the raw size, and a coarse analysis or a plot only
+# needs to touch the coarsest level that still has the bandwidth or pixels asked for.
+###############################################################################
+class Signal_Pyramid:
+    """
+    Anti-aliased multi-resolution copies of a set of columns sampled at a common rate.
+    """
+
+    def __init__(self, levels: list, columns: list, sampling_rate: float, start_time: float = 0.0,
+                 time_column: str = None, usable_fraction: float = 0.8):
+        """
+        Use Signal_Pyramid.build() or Signal_Pyramid.load() rather than calling this directly.
+
+        :param levels: List of (samples x columns) arrays, level 0 first.
+        :param columns: Column names, in array column order.
+        :param sampling_rate: Sampling rate of level 0 in Hz.
+        :param start_time: Time of the first sample (used to rebuild the time column).
+        :param time_column: Name of the time column to add to selected frames, or None.
+        :param usable_fraction: Fraction of each decimated level's Nyquist frequency treated as
+                                clean passband (the anti-alias filter rolls off near Nyquist).
+        """
+        self.levels = levels
+        self.columns = list(columns)
+        self.sampling_rate = float(sampling_rate)
+        self.start_time = float(start_time)
+        self.time_column = time_column
+        self.usable_fraction = usable_fraction
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, columns: list, sampling_rate: float, time_column: str = None,
+              min_samples: int = 1024, max_levels: int = 16, usable_fraction: float = 0.8):
+        """
+        Builds the pyramid by repeated halving until a level would drop below min_samples.
+
+        :param df: DataFrame holding the raw columns (NaN-free).
+        :param columns: Columns to decimate.
+        :param sampling_rate: Sampling rate of df in Hz.
+        :param time_column: Optional time column; its first value becomes the start time.
+        :param min_samples: Stop before a level would have fewer samples than this.
+        :param max_levels: Upper bound on the number of decimated levels.
+        :param usable_fraction: See __init__.
+        """
+        start_time = float(df[time_column].iloc[0]) if time_column is not None else 0.0
+        levels = [df[columns].to_numpy(dtype=np.float64)]
+        while len(levels) <= max_levels and len(levels[-1]) // 2 >= min_samples:
+            levels.append(resample_poly(levels[-1], 1, 2, axis=0))
+        return cls(levels, columns, sampling_rate, start_time, time_column, usable_fraction)
+
+    def level_rate(self, level: int) -> float:
+        return self.sampling_rate / 2 ** level
+
+    def level_bandwidth(self, level: int) -> float:
+        """
+        Highest frequency (Hz) represented without filter roll-off at this level.
+        """
+        nyquist = self.level_rate(level) / 2
+        return nyquist if level == 0 else nyquist * self.usable_fraction
+
+    def level_for_bandwidth(self, bandwidth: float) -> int:
+        """
+        Coarsest level whose usable bandwidth still covers `bandwidth` Hz.
+        """
+        suitable = [level for level in range(len(self.levels)) if self.level_bandwidth(level) >= bandwidth]
+        return max(suitable) if suitable else 0
+
+    def level_for_pixels(self, pixels: int, t_start: float = None, t_end: float = None,
+                         samples_per_pixel: float = 2.0) -> int:
+        """
+        Coarsest level that still has samples_per_pixel samples per pixel across [t_start, t_end).
+        """
+        duration = self._duration(t_start, t_end)
+        suitable = [level for level in range(len(self.levels))
+                    if duration * self.level_rate(level) >= samples_per_pixel * pixels]
+        return max(suitable) if suitable else 0
+
+    def _duration(self, t_start, t_end):
+        full_end = self.start_time + len(self.levels[0]) / self.sampling_rate
+        t_start = self.start_time if t_start is None else max(t_start, self.start_time)
+        t_end = full_end if t_end is None else min(t_end, full_end)
+        return max(t_end - t_start, 0.0)
+
+    def select(self, level: int = None, bandwidth: float = None, pixels: int = None,
+               t_start: float = None, t_end: float = None, samples_per_pixel: float = 2.0):
+        """
+        Returns (DataFrame, sampling_rate) for one level, chosen explicitly, by bandwidth, or by
+        pixel resolution (the coarsest level satisfying every given requirement), restricted to
+        [t_start, t_end) if given. The frame includes the time column when the pyramid has one.
+        """
+        if level is None:
+            requirements = []
+            if bandwidth is not None:
+                requirements.append(self.level_for_bandwidth(bandwidth))
+            if pixels is not None:
+                requirements.append(self.level_for_pixels(pixels, t_start, t_end, samples_per_pixel))
+            level = min(requirements) if requirements else 0
+        level = int(np.clip(level, 0, len(self.levels) - 1))
+
+        rate = self.level_rate(level)
+        data = self.levels[level]
+        start = 0 if t_start is None else max(int(np.ceil((t_start - self.start_time) * rate)), 0)
+        end = len(data) if t_end is None else min(int(np.ceil((t_end - self.start_time) * rate)), len(data))
+        frame = pd.DataFrame(data[start:end], columns=self.columns)
+        if self.time_column is not None:
+            frame.insert(0, self.time_column, self.start_time + np.arange(start, max(end, start)) / rate)
+        return frame, rate
+
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def save(self, path: str):
+        """
+        Stores all levels in one .npz (e.g. next to the raw file as '<name>.pyramid.npz').
+        """
+        meta = {"columns": self.columns, "sampling_rate": self.sampling_rate, "start_time": self.start_time,
+                "time_column": self.time_column, "usable_fraction": self.usable_fraction}
+        np.savez(path, meta=json.dumps(meta), **{f"level_{i}": level for i, level in enumerate(self.levels)})
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Reads a pyramid written by save().
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            levels = [data[f"level_{i}"] for i in range(sum(key.startswith("level_") for key in data.files))]
+        return cls(levels, meta["columns"], meta["sampling_rate"], meta["start_time"],
+                   meta["time_column"], meta["usable_fraction"])
@@ -0,0 +1,178 @@
+# result_cache.py
+
+import collections
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(SCRIPT_DIR, "Results", "analysis_cache")
+
+class Result_Cache:
+    """
+    Content-addressed cache for analysis results (FFT, Welch PSD, STFT, ...).
+
+    A result is keyed by a hash of the analysis name, its parameters, and the raw bytes of
+    every input column, so re-running the same analysis on the same data returns the stored
+    arrays instead of recomputing them. Changing a single sample or parameter changes the key.
+
+    Two tiers:
+        - Memory: an LRU of recent results, bounded by max_memory_mb. Stored arrays are made
+                  read-only, so a caller cannot change what later hits return; copy an array
+                  before modifying it in place.
+        - Disk:   one .npz file per result in cache_dir, bounded by max_disk_mb. When the
+                  directory grows past the limit, the least recently used files are deleted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_memory_mb: float = 256,
+        max_disk_mb: float = 2048,
+        use_disk: bool = True
+    ):
+        """
+        :param cache_dir: Directory for the on-disk .npz tier.
+        :param max_memory_mb: Size limit of the in-memory LRU tier.
+        :param max_disk_mb: Size limit of the on-disk tier.
+        :param use_disk: If False, only the in-memory tier is used.
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.use_disk = use_disk
+        self.memory = collections.OrderedDict()
+        self.memory_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if use_disk:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(analysis: str, df: pd.DataFrame, columns: list, params: dict) -> str:
+        """
+        Builds the cache key from the analysis name, its parameters and the column contents.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(analysis.encode("utf-8"))
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        for col in columns:
+            series = df[col]
+            digest.update(repr(col).encode("utf-8"))
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                values = np.ascontiguousarray(series.to_numpy())
+                digest.update(str(values.dtype).encode("utf-8"))
+            else:
+                # Object columns: hash the values, not the pointers
+                values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _nbytes(result: dict) -> int:
+        return sum(np.asarray(part).nbytes for parts in result.values() for part in parts)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def get(self, key: str, columns: list):
+        """
+        Returns the cached result for key (a dict of column -> tuple of read-only arrays), or None.
+        Every hit gets its own dict and tuples.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return {col: tuple(parts) for col, parts in self.memory[key].items()}
+
+        path = self._path(key)
+        if self.use_disk and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    result = {col: tuple(data[f"{i}_{j}"] for j in range(int(data[f"{i}_n"])))
+                              for i, col in enumerate(columns)}
+            except (OSError, KeyError, ValueError):
+                # Truncated or foreign file: drop it and treat as a miss
+                os.remove(path)
+            else:
+                os.utime(path)  # Mark as recently used for disk eviction
+                self.stats["disk_hits"] += 1
+                self._remember(key, result)
+                return result
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, columns: list, result: dict):
+        """
+        Stores a result in both tiers, then evicts to stay within the size limits.
+        """
+        self._remember(key, result)
+        if not self.use_disk:
+            return
+
+        arrays = {}
+        for i, col in enumerate(columns):
+            parts = result[col]
+            arrays[f"{i}_n"] = np.array(len(parts))
+            for j, part in enumerate(parts):
+                arrays[f"{i}_{j}"] = np.asarray(part)
+        # Write under a temporary name so a crash never leaves a partial .npz behind
+        tmp_path = self._path(key) + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self._path(key))
+        self._evict_disk()
+
+    @staticmethod
+    def _freeze(result: dict) -> dict:
+        frozen = {}
+        for col, parts in result.items():
+            # Copies, so the caller's own arrays stay writable
+            arrays = tuple(np.array(part, copy=True) for part in parts)
+            for array in arrays:
+                array.setflags(write=False)
+            frozen[col] = arrays
+        return frozen
+
+    def _remember(self, key: str, result: dict):
+        """
+        Stores read-only copies of result's arrays in the memory tier; the caller's dict and arrays are not kept.
+        """
+        result = self._freeze(result)
+        size = self._nbytes(result)
+        if size > self.max_memory_bytes:
+            return
+        if key in self.memory:
+            self.memory_bytes -= self._nbytes(self.memory.pop(key))
+        self.memory[key] = result
+        self.memory_bytes += size
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= self._nbytes(evicted)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz") and not name.endswith(".tmp.npz"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """
+        Empties both tiers.
+        """
+        self.memory.clear()
+        self.memory_bytes = 0
+        if self.use_disk:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,149 @@
+# segment_functions.py
+
+import numpy as np
+
+###############################################################################
+# VECTORIZED SEGMENT REDUCTIONS
+# A segment is a half-open sample range [start, stop) between two event indices
+# (pulse edges, peaks, ...). Sums over any number of segments, overlapping or not,
+# come from one cumulative sum: sum(values[start:stop]) = c[stop] - c[start] with
+# c = [0, cumsum(values)]. Other reductions (max, min) use ufunc.reduceat on the
+# interleaved [start0, stop0, start1, stop1, ...] indices and keep every other
+# result. Either way the cost is one pass over the data, not one per segment.
+###############################################################################
+
+def segment_bounds(starts, stops, n: int):
+    """
+    Returns (starts, stops) as intp arrays clipped to [0, n]. Raises if the lengths differ.
+    """
+    starts = np.clip(np.asarray(starts, dtype=np.intp), 0, n)
+    stops = np.clip(np.asarray(stops, dtype=np.intp), 0, n)
+    if starts.shape != stops.shape:
+        raise ValueError(f"Got {len(starts)} segment starts but {len(stops)} stops.")
+    return starts, stops
+
+def segment_sums(values: np.ndarray, starts, stops) -> np.ndarray:
+    """
+    sum(values[start:stop]) for every segment, by cumulative-sum differencing.
+    Empty segments (stop <= start) sum to 0.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts, stops = segment_bounds(starts, stops, len(values))
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    return np.where(stops > starts, cumulative[stops] - cumulative[np.minimum(starts, stops)], 0.0)
+
+def segment_reduce(ufunc, values: np.ndarray, starts, stops, empty=np.nan) -> np.ndarray:
+    """
+    ufunc.reduce(values[start:stop]) for every segment (e.g. np.maximum, np.minimum), by
+    ufunc.reduceat. Empty segments get `empty`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts, stops = segment_bounds(starts, stops, len(values))
+    valid = stops > starts
+    result = np.full(len(starts), empty, dtype=np.float64)
+    if not valid.any():
+        return result
+    # reduceat needs indices < len(values); a trailing pad makes stop == len(values) legal
+    padded = np.append(values, 0.0)
+    indices = np.column_stack([starts[valid], stops[valid]]).ravel()
+    result[valid] = ufunc.reduceat(padded, indices)[::2]
+    return result
+
+def trapezoid_intervals(y: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Trapezoid area of each sample interval [i, i + 1]; segment_sums of these over
+    [start, stop - 1) is the trapezoid integral of y from t[start] to t[stop - 1].
+    """
+    y = np.asarray(y, dtype=np.float64)
+    return np.diff(np.asarray(t, dtype=np.float64)) * (y[1:] + y[:-1]) / 2
+
+###############################################################################
+# SEGMENT FEATURES
+# Features that need a per-sample comparison against a per-segment level (rise
+# time) map every sample to its segment once (np.searchsorted on the starts), so
+# the level is broadcast with a single fancy index and the first sample reaching
+# it is again found with np.searchsorted. This needs non-overlapping segments.
+###############################################################################
+
+SEGMENT_FEATURES = ("count", "duration", "mean", "rms", "min", "max", "peak_to_peak", "area", "rise_time")
+
+def segment_owner(starts: np.ndarray, stops: np.ndarray, n: int) -> np.ndarray:
+    """
+    Segment index of every sample, or -1 for samples outside all segments.
+    Segments must be sorted and non-overlapping.
+    """
+    owner = np.searchsorted(starts, np.arange(n), side="right") - 1
+    inside = owner >= 0
+    inside[inside] = np.arange(n)[inside] < stops[owner[inside]]
+    return np.where(inside, owner, -1)
+
+def first_reaching(values: np.ndarray, levels: np.ndarray, starts: np.ndarray, stops: np.ndarray,
+                   owner: np.ndarray) -> np.ndarray:
+    """
+    Index of the first sample in each segment with value >= that segment's level; -1 if none.
+    """
+    hits = np.flatnonzero((owner >= 0) & (values >= levels[np.maximum(owner, 0)]))
+    hits = np.append(hits, len(values))  # Sentinel: no hit before the end
+    first = hits[np.searchsorted(hits, starts)]
+    return np.where(first < stops, first, -1)
+
+def segment_features(values: np.ndarray, starts, stops, features=SEGMENT_FEATURES, t: np.ndarray = None,
+                     rise_levels=(0.1, 0.9)) -> dict:
+    """
+    Computes the requested features for every segment [start, stop) of one signal.
+
+    :param values: 1D signal.
+    :param starts, stops: Segment bounds (sample indices, same length).
+    :param features: Names from SEGMENT_FEATURES.
+    :param t: Sample times; defaults to the sample index.
+    :param rise_levels: Fractions of the segment's min-to-max range used for rise_time.
+    :return: Dict of feature name -> array with one value per segment (NaN for empty segments).
+    """
+    unknown = set(features) - set(SEGMENT_FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown segment features {sorted(unknown)}; choose from {SEGMENT_FEATURES}.")
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    starts, stops = segment_bounds(starts, stops, n)
+    t = np.arange(n, dtype=np.float64) if t is None else np.asarray(t, dtype=np.float64)
+    count = np.maximum(stops - starts, 0)
+    empty = count == 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        last = np.maximum(stops - 1, 0)
+
+        result = {}
+        if "count" in features:
+            result["count"] = count
+        if "duration" in features:
+            result["duration"] = np.where(empty, np.nan, t[np.minimum(last, n - 1)] - t[np.minimum(starts, n - 1)])
+        if "mean" in features:
+            result["mean"] = np.where(empty, np.nan, segment_sums(values, starts, stops) / count)
+        if "rms" in features:
+            result["rms"] = np.where(empty, np.nan, np.sqrt(segment_sums(values * values, starts, stops) / count))
+        if {"min", "max", "peak_to_peak", "rise_time"} & set(features):
+            seg_min = segment_reduce(np.minimum, values, starts, stops)
+            seg_max = segment_reduce(np.maximum, values, starts, stops)
+            if "min" in features:
+                result["min"] = seg_min
+            if "max" in features:
+                result["max"] = seg_max
+            if "peak_to_peak" in features:
+                result["peak_to_peak"] = seg_max - seg_min
+        if "area" in features:
+            area = segment_sums(trapezoid_intervals(values, t), starts, np.maximum(stops - 1, starts))
+            result["area"] = np.where(empty, np.nan, area)
+        if "rise_time" in features:
+            # Empty segments own no samples; leave them out of the sample -> segment map
+            order = np.flatnonzero(~empty)
+            order = order[np.argsort(starts[order], kind="stable")]
+            s_starts, s_stops = starts[order], stops[order]
+            if np.any(s_starts[1:] < s_stops[:-1]):
+                raise ValueError("rise_time needs non-overlapping segments.")
+            owner = segment_owner(s_starts, s_stops, n)
+            span = seg_max[order] - seg_min[order]
+            low = first_reaching(values, seg_min[order] + rise_levels[0] * span, s_starts, s_stops, owner)
+            high = first_reaching(values, seg_min[order] + rise_levels[1] * span, s_starts, s_stops, owner)
+            result["rise_time"] = np.full(len(starts), np.nan)
+            result["rise_time"][order] = np.where((low >= 0) & (high >= 0),
+                                                  t[np.maximum(high, 0)] - t[np.maximum(low, 0)], np.nan)
+    return {name: result[name] for name in features}
@@ -0,0 +1,411 @@
+# streaming_functions.py
+
+import json
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import get_window, welch
+
+###############################################################################
+# STREAMING ACCUMULATORS
+# Stateful counterparts of Analysis_Functions methods for data that arrives in
+# chunks (e.g. pd.read_csv(..., chunksize=N)) and does not fit in memory at once.
+###############################################################################
+class Streaming_Welch:
+    """
+    Incremental Welch PSD for one signal, fed one chunk at a time.
+
+    Mirrors scipy.signal.welch with its defaults (Hann window, constant detrend, density
+    scaling, mean averaging, one-sided spectrum). Samples that do not yet fill a segment are
+    carried over to the next chunk, so segments overlap across chunk boundaries exactly as
+    they would in a single call on the whole signal.
+    """
+
+    def __init__(
+        self,
+        sampling_rate: float = 1.0,
+        nperseg: int = 256,
+        noverlap: int = None,
+        window: str = "hann"
+    ):
+        """
+        :param sampling_rate: Sampling rate in Hz.
+        :param nperseg: Length of each segment.
+        :param noverlap: Points shared by consecutive segments. Defaults to nperseg // 2.
+        :param window: Window name understood by scipy.signal.get_window.
+        """
+        self.sampling_rate = sampling_rate
+        self.nperseg = nperseg
+        self.noverlap = nperseg // 2 if noverlap is None else noverlap
+        if not 0 <= self.noverlap < nperseg:
+            raise ValueError("noverlap must be in [0, nperseg).")
+        self.step = nperseg - self.noverlap
+        self.window_name = window
+        self.window = get_window(window, nperseg)
+        self.scale = 1.0 / (sampling_rate * (self.window ** 2).sum())
+        self.freq = np.fft.rfftfreq(nperseg, d=1.0/sampling_rate)
+
+        self.buffer = np.empty(0)
+        self.power_sum = np.zeros(len(self.freq))
+        self.num_segments = 0
+        self.num_samples = 0
+
+    def update(self, chunk: np.ndarray):
+        """
+        Adds the next block of samples and folds every completed segment into the running sum.
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        self.num_samples += len(chunk)
+        data = np.concatenate([self.buffer, chunk]) if len(self.buffer) else chunk
+        if len(data) < self.nperseg:
+            self.buffer = data
+            return
+
+        segments = sliding_window_view(data, self.nperseg)[::self.step]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segments * self.window, axis=1)
+        self.power_sum += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+        self.num_segments += len(segments)
+        # Keep everything from the first segment start not yet used
+        self.buffer = data[len(segments) * self.step:].copy()
+
+    def estimate(self):
+        """
+        Returns (freq, psd) from the segments seen so far. Can be called at any time;
+        further updates keep refining the estimate.
+        """
+        if self.num_segments == 0:
+            if len(self.buffer) == 0:
+                return self.freq, np.full(len(self.freq), np.nan)
+            # Shorter than one segment: same fallback as scipy (nperseg shrinks to the signal length)
+            return welch(self.buffer, fs=self.sampling_rate, window=self.window_name, nperseg=len(self.buffer))
+
+        psd = self.power_sum * self.scale / self.num_segments
+        # One-sided spectrum: double everything except DC (and Nyquist for even nperseg)
+        if self.nperseg % 2:
+            psd[1:] *= 2
+        else:
+            psd[1:-1] *= 2
+        return self.freq, psd
+
+class Streaming_STFT:
+    """
+    Incremental STFT for one signal that writes each spectrogram frame to disk as it is computed.
+
+    Frame layout matches scipy.signal.stft with its defaults (Hann window, zero boundary
+    extension, zero padding of the final segment, 'spectrum' scaling). Frames are appended
+    time-major to a raw float32 (magnitude) or complex64 file, so memory use is bounded by one
+    chunk regardless of recording length. finalize() returns an STFT_Store over that file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sampling_rate: float = 1.0,
+        nperseg: int = 256,
+        noverlap: int = None,
+        magnitude: bool = True,
+        window: str = "hann"
+    ):
+        """
+        :param path: Output file for the frames; metadata is written next to it as path + '.json'.
+        :param sampling_rate: Sampling rate in Hz.
+        :param nperseg: Length of each segment.
+        :param noverlap: Points shared by consecutive segments. Defaults to nperseg // 2.
+        :param magnitude: If True store |Zxx| as float32, otherwise the complex values as complex64.
+        :param window: Window name understood by scipy.signal.get_window.
+        """
+        self.path = path
+        self.sampling_rate = sampling_rate
+        self.nperseg = nperseg
+        self.noverlap = nperseg // 2 if noverlap is None else noverlap
+        if not 0 <= self.noverlap < nperseg:
+            raise ValueError("noverlap must be in [0, nperseg).")
+        self.step = nperseg - self.noverlap
+        self.magnitude = magnitude
+        self.dtype = np.float32 if magnitude else np.complex64
+        self.window = get_window(window, nperseg)
+        self.scale = 1.0 / self.window.sum()
+
+        # Zero boundary extension at the start, as scipy.signal.stft(boundary='zeros')
+        self.buffer = np.zeros(nperseg // 2)
+        self.num_samples = 0
+        self.num_frames = 0
+        self.file = open(path, "wb")
+
+    def _write_segments(self, data: np.ndarray) -> int:
+        if len(data) < self.nperseg:
+            return 0
+        segments = sliding_window_view(data, self.nperseg)[::self.step]
+        spectra = np.fft.rfft(segments * self.window, axis=1) * self.scale
+        frames = np.abs(spectra) if self.magnitude else spectra
+        frames.astype(self.dtype).tofile(self.file)
+        self.num_frames += len(segments)
+        return len(segments)
+
+    def update(self, chunk: np.ndarray):
+        """
+        Adds the next block of samples and writes every frame that is now complete.
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        self.num_samples += len(chunk)
+        data = np.concatenate([self.buffer, chunk])
+        written = self._write_segments(data)
+        self.buffer = data[written * self.step:].copy()
+
+    def finalize(self):
+        """
+        Flushes the last frames (zero boundary + padding), closes the file and returns an STFT_Store.
+        """
+        edge = self.nperseg // 2
+        padded_length = self.num_samples + 2 * edge
+        num_pad = (-(padded_length - self.nperseg) % self.step) % self.nperseg
+        self._write_segments(np.concatenate([self.buffer, np.zeros(edge + num_pad)]))
+        self.buffer = np.empty(0)
+        self.file.close()
+
+        meta = {
+            "num_frames": self.num_frames,
+            "num_freqs": self.nperseg // 2 + 1,
+            "dtype": np.dtype(self.dtype).name,
+            "sampling_rate": self.sampling_rate,
+            "nperseg": self.nperseg,
+            "step": self.step,
+            "num_samples": self.num_samples,
+        }
+        with open(self.path + ".json", "w") as f:
+            json.dump(meta, f)
+        return STFT_Store(self.path)
+
+class STFT_Store:
+    """
+    Lazy handle on a spectrogram written by Streaming_STFT.
+
+    The frames stay on disk in a read-only np.memmap; only what you slice is read into memory.
+    Rows are time frames and columns are frequency bins.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Frame file written by Streaming_STFT (its '.json' metadata must sit next to it).
+        """
+        self.path = path
+        with open(path + ".json", "r") as f:
+            self.meta = json.load(f)
+        shape = (self.meta["num_frames"], self.meta["num_freqs"])
+        if shape[0] == 0:
+            self.frames = np.empty(shape, dtype=self.meta["dtype"])
+        else:
+            self.frames = np.memmap(path, dtype=self.meta["dtype"], mode="r", shape=shape)
+        self.freq = np.fft.rfftfreq(self.meta["nperseg"], d=1.0/self.meta["sampling_rate"])
+        self.times = np.arange(shape[0]) * self.meta["step"] / self.meta["sampling_rate"]
+
+    @property
+    def shape(self):
+        return self.frames.shape
+
+    def __len__(self):
+        return self.frames.shape[0]
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def time_slice(self, t_start: float = None, t_end: float = None):
+        """
+        Returns (freq, time, Zxx) for frames with t_start <= time < t_end, in the same
+        orientation as analyze_stft (Zxx has one column per frame).
+        """
+        start = 0 if t_start is None else int(np.searchsorted(self.times, t_start, side="left"))
+        end = len(self.times) if t_end is None else int(np.searchsorted(self.times, t_end, side="left"))
+        return self.freq, self.times[start:end], np.asarray(self.frames[start:end]).T
+
+class Quantile_Sketch:
+    """
+    Fixed-memory, mergeable quantile sketch (KLL-style compactor hierarchy).
+
+    Values are kept exactly until more than k have been seen; after that, full levels are
+    sorted and every other item is promoted to the next level with double weight. Memory
+    stays around 3 * k values per sketch, and the rank error is roughly 1/k of the count.
+    """
+
+    def __init__(self, k: int = 2048):
+        """
+        :param k: Capacity of the top level; larger means more memory and smaller error.
+        """
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.compactions = 0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # Keep one item back if the count is odd; alternate the offset between compactions
+                keep = items[:len(items) % 2]
+                paired = items[len(items) % 2:]
+                offset = self.compactions % 2
+                self.compactions += 1
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], paired[offset::2]])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, values: np.ndarray):
+        """
+        Adds a block of (NaN-free) values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: "Quantile_Sketch"):
+        """
+        Folds another sketch into this one.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.compactions += other.compactions
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile(s); exact (linear interpolation, as pandas) while nothing was compacted.
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], q)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_), 2.0 ** level) for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # Value at weighted rank q * (n - 1), matching the linear-quantile rank convention
+        ranks = np.asarray(q) * (cumulative[-1] - 1) + 1
+        return items[np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)]
+
+class Online_Statistics:
+    """
+    Streaming, mergeable descriptive statistics for several columns.
+
+    Count, mean, min, max and the central moments M2..M4 are updated chunk by chunk and merged
+    with the pairwise formulas of Chan et al. / Pebay, so the result for a file split across
+    chunks or worker processes equals the one-pass result up to floating-point rounding.
+    Quartiles come from one Quantile_Sketch per column.
+    """
+
+    def __init__(self, columns: list, sketch_size: int = 2048):
+        """
+        :param columns: Columns to track.
+        :param sketch_size: k of each column's Quantile_Sketch.
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.n = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.m4 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+        self.sketches = [Quantile_Sketch(sketch_size) for _ in self.columns]
+
+    def _merge_moments(self, n, mean, m2, m3, m4):
+        n_a, n_b = self.n, n
+        total = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.where(n_b > 0, mean - self.mean, 0.0)
+            safe_total = np.where(total > 0, total, 1.0)
+            new_mean = self.mean + delta * n_b / safe_total
+            new_m2 = self.m2 + m2 + delta ** 2 * n_a * n_b / safe_total
+            new_m3 = (self.m3 + m3 + delta ** 3 * n_a * n_b * (n_a - n_b) / safe_total ** 2
+                      + 3 * delta * (n_a * m2 - n_b * self.m2) / safe_total)
+            new_m4 = (self.m4 + m4 + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / safe_total ** 3
+                      + 6 * delta ** 2 * (n_a ** 2 * m2 + n_b ** 2 * self.m2) / safe_total ** 2
+                      + 4 * delta * (n_a * m3 - n_b * self.m3) / safe_total)
+        # Columns the other side has no data for stay untouched
+        has_data = n_b > 0
+        self.mean = np.where(has_data, new_mean, self.mean)
+        self.m2 = np.where(has_data, new_m2, self.m2)
+        self.m3 = np.where(has_data, new_m3, self.m3)
+        self.m4 = np.where(has_data, new_m4, self.m4)
+        self.n = total
+
+    def update(self, chunk):
+        """
+        Adds one DataFrame chunk; NaNs are skipped as in DataFrame.describe().
+        """
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, np.nansum(values, axis=0) / np.where(n > 0, n, 1), 0.0)
+            centered = np.where(valid, values - mean, 0.0)
+        squared = centered ** 2
+        self._merge_moments(n, mean, squared.sum(axis=0), (squared * centered).sum(axis=0), (squared ** 2).sum(axis=0))
+        if len(values):
+            self.min = np.fmin(self.min, np.nanmin(np.where(valid, values, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(valid, values, -np.inf), axis=0))
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(values[valid[:, i], i])
+        return self
+
+    def merge(self, other: "Online_Statistics"):
+        """
+        Folds in the statistics of another accumulator over the same columns (e.g. from a worker).
+        """
+        if other.columns != self.columns:
+            raise ValueError("Can only merge statistics over the same columns.")
+        self._merge_moments(other.n, other.mean, other.m2, other.m3, other.m4)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def result(self, additional_stats: bool = False) -> pd.DataFrame:
+        """
+        Statistics in the layout of Analysis_Functions.descriptive_statistics: rows count, mean,
+        std, min, 25%, 50%, 75%, max (plus skew and kurt), one column per tracked column.
+        """
+        n = self.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(n > 1, np.sqrt(self.m2 / np.where(n > 1, n - 1, 1)), np.nan)
+            quartiles = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.sketches]).T
+            rows = {
+                "count": n,
+                "mean": np.where(n > 0, self.mean, np.nan),
+                "std": std,
+                "min": np.where(n > 0, self.min, np.nan),
+                "25%": quartiles[0],
+                "50%": quartiles[1],
+                "75%": quartiles[2],
+                "max": np.where(n > 0, self.max, np.nan),
+            }
+            if additional_stats:
+                # Bias-corrected sample skewness and excess kurtosis, as DataFrame.skew()/kurt()
+                flat = self.m2 == 0
+                skew = n * np.sqrt(n - 1) / (n - 2) * self.m3 / self.m2 ** 1.5
+                kurt = (n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2)
+                        - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+                rows["skew"] = np.where(n < 3, np.nan, np.where(flat, 0.0, skew))
+                rows["kurt"] = np.where(n < 4, np.nan, np.where(flat, 0.0, kurt))
+        return pd.DataFrame(rows, index=self.columns).T
+
+def chunk_statistics(chunk, columns: list, sketch_size: int = 2048) -> Online_Statistics:
+    """
+    Online_Statistics of a single chunk; picklable entry point for worker processes.
+    """
+    return Online_Statistics(columns, sketch_size).update(chunk)
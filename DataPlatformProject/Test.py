@@ -3,9 +3,11 @@
 from Config_Manager import Config_Manager
 from Import_Functions import Import_Functions
 from Analysis_Functions import Analysis_Functions
+from Result_Cache import Result_Cache
 from Data_Manipulation_Functions import Data_Manipulation_Functions
 from Plotting_Functions import Plotting_Functions
 import os
+import time
 # ... etc.
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,7 +19,15 @@ def main():
 
     config = Config_Manager("Test_config.yaml")
     importer = Import_Functions()
-    analyzer = Analysis_Functions()
+    cache = None
+    if config.get('analysis_functions.result_cache.enabled', False):
+        cache = Result_Cache(
+            cache_dir=os.path.join(SCRIPT_DIR, config.get('analysis_functions.result_cache.cache_dir')),
+            max_memory_mb=config.get('analysis_functions.result_cache.max_memory_mb', 256),
+            max_disk_mb=config.get('analysis_functions.result_cache.max_disk_mb', 2048),
+            use_disk=config.get('analysis_functions.result_cache.use_disk', True)
+        )
+    analyzer = Analysis_Functions(cache=cache)
     manipulator = Data_Manipulation_Functions()
     plotter = Plotting_Functions()
 
@@ -31,6 +41,16 @@ def main():
 
     plotter.plot_fft_spectrum(fft_results, save_path=os.path.join(OUT_DIR, 'Voltage_FFT.png'))
 
+    # Default vs batched (SOS, float32 output) filtering; each path also logs its own elapsed time
+    start = time.perf_counter()
+    analyzer.filter_data(df_csv, ['Voltage'], cutoff_freq=5.0, sampling_rate=sampling_rate)
+    default_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer.filter_data(df_csv, ['Voltage'], cutoff_freq=5.0, sampling_rate=sampling_rate, batched=True)
+    batched_seconds = time.perf_counter() - start
+    print(f"filter_data: default {default_seconds:.3f}s, batched {batched_seconds:.3f}s "
+          f"({default_seconds - batched_seconds:+.3f}s saved)")
+
     # manipulator.export_csv(stats_df, os.path.join(OUT_DIR, 'Stats.csv'))
 
 if __name__ == "__main__":
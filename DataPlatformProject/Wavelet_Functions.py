@@ -0,0 +1,137 @@
+# wavelet_functions.py
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.fft import next_fast_len
+
+try:
+    import pywt
+except ImportError:
+    pywt = None
+
+###############################################################################
+# FFT-BASED CONTINUOUS WAVELET TRANSFORM
+# Same coefficients as pywt.cwt (integrated mother wavelet, resampled per scale,
+# convolved with the signal and differentiated), but computed block by block with
+# one FFT per block shared by all scales, written as float32, and optionally split
+# across worker processes and straight into a memory-mapped output file.
+###############################################################################
+
+# Real mother wavelets available without PyWavelets, on pywt's support of [-8, 8]
+BUILTIN_WAVELETS = {
+    "morl": lambda x: np.exp(-x ** 2 / 2) * np.cos(5 * x),
+    "mexh": lambda x: 2 / (np.sqrt(3) * np.pi ** 0.25) * (1 - x ** 2) * np.exp(-x ** 2 / 2),
+}
+
+def integrated_wavelet(wavelet: str = "morl", precision: int = 12):
+    """
+    Returns (int_psi, x): the running integral of the mother wavelet on a 2**precision grid.
+    Uses PyWavelets when installed (any continuous wavelet), otherwise the built-in ones.
+    """
+    if pywt is not None:
+        return pywt.integrate_wavelet(wavelet, precision=precision)
+    if wavelet not in BUILTIN_WAVELETS:
+        raise ValueError(f"Wavelet '{wavelet}' needs PyWavelets; built-in options are {sorted(BUILTIN_WAVELETS)}.")
+    x = np.linspace(-8, 8, 2 ** precision)
+    return np.cumsum(BUILTIN_WAVELETS[wavelet](x)) * (x[1] - x[0]), x
+
+def scale_kernel(int_psi: np.ndarray, x: np.ndarray, scale: float) -> np.ndarray:
+    """
+    The integrated wavelet resampled for one scale (time-reversed, ready for convolution).
+    """
+    step = x[1] - x[0]
+    j = (np.arange(scale * (x[-1] - x[0]) + 1) / (scale * step)).astype(int)
+    j = j[j < int_psi.size]
+    return int_psi[j][::-1]
+
+def _cwt_rows(signal, scales, rows, int_psi, x, block_size, out_path, shape, dtype):
+    """
+    Computes the CWT rows for a subset of scales. Writes them into the memmap at out_path
+    when given (returns None), otherwise returns them as an array.
+    """
+    n = len(signal)
+    kernels = [scale_kernel(int_psi, x, scale) for scale in scales]
+    halo = max(len(kernel) for kernel in kernels)
+    n_fft = next_fast_len(block_size + 3 * halo, real=not np.iscomplexobj(int_psi))
+    complex_kernel = np.iscomplexobj(int_psi)
+    fft, ifft = (np.fft.fft, np.fft.ifft) if complex_kernel else (np.fft.rfft, np.fft.irfft)
+    kernel_spectra = [fft(kernel, n_fft) for kernel in kernels]
+
+    if out_path is not None:
+        out = np.memmap(out_path, dtype=dtype, mode="r+", shape=shape)
+    else:
+        out = np.empty((len(scales), n), dtype=dtype)
+        rows = range(len(scales))
+
+    padded = np.concatenate([np.zeros(halo), signal, np.zeros(block_size + 2 * halo)])
+    for t0 in range(0, n, block_size):
+        t1 = min(t0 + block_size, n)
+        # Segment covering signal[t0 - halo : t0 + block_size + halo], zero-padded outside the record
+        segment_spectrum = fft(padded[t0:t0 + block_size + 2 * halo], n_fft)
+        for scale, kernel, kernel_spectrum, row in zip(scales, kernels, kernel_spectra, rows):
+            conv = ifft(segment_spectrum * kernel_spectrum, n_fft)
+            # Full-convolution index m maps to conv[m - t0 + halo]; pywt keeps m in [t0+off, t1+off]
+            offset = (len(kernel) - 2) // 2
+            start = offset + halo
+            coef = -np.sqrt(scale) * np.diff(conv[start:start + (t1 - t0) + 1])
+            out[row, t0:t1] = coef if np.iscomplexobj(out) else coef.real
+
+    if out_path is not None:
+        out.flush()
+        return None
+    return out
+
+def cwt_fft(
+    signal: np.ndarray,
+    scales: np.ndarray,
+    wavelet: str = "morl",
+    block_size: int = 65536,
+    workers: int = 1,
+    out_path: str = None,
+    dtype: str = "float32"
+):
+    """
+    FFT-based, blocked CWT of one signal; returns a (len(scales), len(signal)) array.
+
+    :param signal: 1D signal.
+    :param scales: Positive scales (as for pywt.cwt).
+    :param wavelet: Mother wavelet name.
+    :param block_size: Samples per block; memory per worker is a few blocks per scale group.
+    :param workers: Worker processes; scales are split across them.
+    :param out_path: If given, coefficients are written to this file and an np.memmap is returned.
+    :param dtype: Output precision ('float32' or 'float64'; complex wavelets give complex output).
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    scales = np.atleast_1d(np.asarray(scales, dtype=np.float64))
+    if np.any(scales <= 0):
+        raise ValueError("scales must only include positive values")
+    int_psi, x = integrated_wavelet(wavelet)
+    if np.iscomplexobj(int_psi):
+        int_psi = np.conj(int_psi)
+        dtype = np.result_type(dtype, np.complex64)
+    shape = (len(scales), len(signal))
+
+    if out_path is not None:
+        out = np.memmap(out_path, dtype=dtype, mode="w+", shape=shape)
+        out.flush()
+    workers = max(1, min(workers, len(scales)))
+    # Interleave scales so each worker gets a mix of short and long kernels
+    groups = [np.arange(w, len(scales), workers) for w in range(workers)]
+
+    if workers == 1:
+        result = _cwt_rows(signal, scales, groups[0], int_psi, x, block_size, out_path, shape, dtype)
+        return out if out_path is not None else result
+
+    if out_path is None:
+        out = np.empty(shape, dtype=dtype)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_cwt_rows, signal, scales[rows], rows, int_psi, x, block_size, out_path, shape, dtype)
+                   for rows in groups]
+        for rows, future in zip(groups, futures):
+            rows_out = future.result()
+            if out_path is None:
+                out[rows] = rows_out
+    if out_path is not None:
+        # Re-open so the returned map sees the rows the workers wrote
+        return np.memmap(out_path, dtype=dtype, mode="r+", shape=shape)
+    return out
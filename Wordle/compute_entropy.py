@@ -36,6 +36,208 @@ class ComputeEntropy:
         entropy = -sum(p * log2(p) for p in probabilities if p > 0)
         return word, entropy
 
+    @staticmethod
+    def encode_words(words):
+        """Encode a list of five-letter words as an (N, 5) uint8 array of letter codes."""
+        return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, 5)
+
+    @staticmethod
+    def compute_pattern_matrix(guesses, answers, chunk_size=512):
+        """Compute the feedback pattern index (0-242) of every guess against every answer.
+
+        Indices follow the order of generate_all_patterns() (G=0, Y=1, B=2 as base-3 digits),
+        so ALL_POSSIBLE_PATTERNS[index] is the matching pattern string.
+        """
+        guess_codes = ComputeEntropy.encode_words(guesses)
+        answer_codes = ComputeEntropy.encode_words(answers)
+
+        # presence[letter, answer] is True when the letter appears anywhere in the answer
+        presence = np.zeros((256, len(answers)), dtype=bool)
+        for i in range(5):
+            presence[answer_codes[:, i], np.arange(len(answers))] = True
+
+        patterns = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+        for start in range(0, len(guesses), chunk_size):
+            block = guess_codes[start:start + chunk_size]
+            acc = np.zeros((len(block), len(answers)), dtype=np.uint8)
+            for i in range(5):
+                green = block[:, i, None] == answer_codes[None, :, i]
+                digit = np.where(green, 0, np.where(presence[block[:, i]], 1, 2)).astype(np.uint8)
+                acc = acc * 3 + digit
+            patterns[start:start + chunk_size] = acc
+        return patterns
+
+    @staticmethod
+    def compute_pattern_histograms(guesses, answers, chunk_size=512):
+        """Count how many answers fall into each of the 243 feedback buckets, per guess.
+
+        Guesses are processed chunk_size rows at a time so the full pattern matrix is never held.
+        """
+        counts = np.empty((len(guesses), 243), dtype=np.int64)
+        for start in range(0, len(guesses), chunk_size):
+            block = guesses[start:start + chunk_size]
+            patterns = ComputeEntropy.compute_pattern_matrix(block, answers).astype(np.int64)
+            offsets = np.arange(len(block), dtype=np.int64)[:, None] * 243
+            counts[start:start + len(block)] = np.bincount((patterns + offsets).ravel(), minlength=len(block) * 243).reshape(-1, 243)
+        return counts
+
+    @staticmethod
+    def entropies_from_histograms(counts):
+        """Entropy (bits) of each row of a (guesses, 243) bucket-count array."""
+        probabilities = counts / counts.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return -np.nansum(probabilities * np.log2(probabilities), axis=1)
+
+    @staticmethod
+    def guess_signatures(guesses, words):
+        """Key each guess so that guesses with equal keys give identical feedback against every word.
+
+        A letter that occurs in none of the words scores B wherever it is placed, so all such letters
+        are replaced by one placeholder and the rest of the guess is kept. No patterns are computed,
+        so this is only a cheap first pass: guesses with different keys can still be equivalent.
+        """
+        guess_codes = ComputeEntropy.encode_words(guesses).astype(np.int64)
+        present = np.zeros(256, dtype=bool)
+        present[ComputeEntropy.encode_words(words).ravel()] = True
+        masked = np.where(present[guess_codes], guess_codes, 0)
+        return masked @ (256 ** np.arange(5, dtype=np.int64))
+
+    @staticmethod
+    def equivalence_classes(patterns):
+        """Label the rows of a pattern matrix so that identical rows share a label.
+
+        Rows are hashed to uint64 and grouped by hash; the grouping is verified against the rows
+        themselves and falls back to an exact row comparison on a hash collision.
+        Returns (index of the first row of each class, class label of every row).
+        """
+        multipliers = np.random.default_rng(0).integers(1, 2**63, size=patterns.shape[1], dtype=np.uint64) | np.uint64(1)
+        hashes = (patterns.astype(np.uint64) * multipliers).sum(axis=1, dtype=np.uint64)  # wraps mod 2**64
+        _, first, labels = np.unique(hashes, return_index=True, return_inverse=True)
+        if not (patterns == patterns[first[labels]]).all():
+            _, first, labels = np.unique(patterns, axis=0, return_index=True, return_inverse=True)
+        return first, labels.ravel()
+
+    @staticmethod
+    def collapse_equivalent_guesses(guesses, words, tie_break="candidate"):
+        """Group guesses that split the remaining words into exactly the same buckets.
+
+        Guesses are first grouped by guess_signatures, and the pattern matrix is computed for one
+        guess per signature only; those rows are then grouped by equivalence_classes.
+        tie_break picks each group's representative: "candidate" prefers a word that is still a
+        possible answer (then the earliest), "first" takes the earliest, "alphabetical" the smallest.
+        Returns (class pattern rows, representative guess indices, class sizes), classes in the
+        order of their representatives.
+        """
+        if tie_break == "first":
+            priority = np.arange(len(guesses))
+        elif tie_break == "alphabetical":
+            priority = np.argsort(np.argsort(np.asarray(guesses)))
+        elif tie_break == "candidate":
+            remaining = set(words)
+            priority = np.arange(len(guesses)) + len(guesses) * np.array([guess not in remaining for guess in guesses])
+        else:
+            raise ValueError(f"Unknown tie_break: {tie_break}")
+        _, signature_first, signature_labels = np.unique(ComputeEntropy.guess_signatures(guesses, words),
+                                                          return_index=True, return_inverse=True)
+        patterns = ComputeEntropy.compute_pattern_matrix([guesses[i] for i in signature_first], words)
+        first, class_labels = ComputeEntropy.equivalence_classes(patterns)
+        labels = class_labels[signature_labels.ravel()]
+        order = np.lexsort((priority, labels))
+        representatives = order[np.searchsorted(labels[order], np.arange(len(first)))]
+        by_position = np.argsort(representatives)  # keep classes in guess order so argmax ties resolve as before
+        return patterns[first][by_position], representatives[by_position], np.bincount(labels)[by_position]
+
+    @staticmethod
+    def entropy_upper_bounds(guesses, words):
+        """Cheap upper bound on the feedback entropy of each guess over the remaining words.
+
+        A pattern is the joint outcome of five per-position G/Y/B outcomes, whose marginals follow
+        from positional and letter-coverage counts alone. Joint entropy never exceeds the sum of the
+        marginal entropies, nor log2 of the number of reachable patterns.
+        """
+        word_codes = ComputeEntropy.encode_words(words).astype(np.int64) - ord("a")
+        guess_codes = ComputeEntropy.encode_words(guesses).astype(np.int64) - ord("a")
+        n = len(words)
+
+        coverage = np.zeros((n, 26), dtype=bool)
+        for i in range(5):
+            coverage[np.arange(n), word_codes[:, i]] = True
+        contains = coverage.sum(axis=0) / n
+
+        bound = np.zeros(len(guesses))
+        for i in range(5):
+            p_green = np.bincount(word_codes[:, i], minlength=26)[guess_codes[:, i]] / n
+            p_present = contains[guess_codes[:, i]]
+            for p in (p_green, p_present - p_green, 1 - p_present):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    bound -= np.where(p > 0, p * np.log2(p), 0.0)
+        return np.minimum(bound, np.log2(min(n, 243)))
+
+    @staticmethod
+    def best_entropy_guess(words, guess_pool, batch_size=512, collapse=False, tie_break="candidate", stats=None):
+        """Return the guess from guess_pool (which may hold eliminated words) with the highest entropy.
+
+        The remaining words are scored first, exactly as the candidates-only path does. Pool words
+        are then visited in order of decreasing upper bound, a batch of exact histograms at a time,
+        until no remaining bound can beat the best so far. Ties go to words that are still possible
+        answers. Returns (word, entropy, number of pool guesses scored exactly).
+
+        With collapse=True, each batch of pool words is collapsed with collapse_equivalent_guesses
+        (tie_break picks the representative) and one histogram is computed per class; classes
+        whose pattern row was already scored in an earlier batch are skipped. Candidates are never
+        collapsed, since each one alone produces the all-green pattern against itself. With the
+        "candidate" or "first" tie_break the result is the same as with collapse=False.
+        If a stats dict is passed, the number of guesses covered and of classes actually scored
+        are added to stats["guesses"] and stats["classes"].
+        """
+        if len(words) <= 2:
+            return words[0], float(len(words) > 1), 0
+
+        def score(batch_words, is_candidate, counts=None):
+            if counts is None:
+                counts = ComputeEntropy.compute_pattern_histograms(batch_words, words)
+            if stats is not None:
+                stats["classes"] = stats.get("classes", 0) + len(batch_words)
+            entropies = ComputeEntropy.entropies_from_histograms(counts)
+            best = int(np.argmax(entropies))
+            return (round(float(entropies[best]), 12), is_candidate), batch_words[best]
+
+        if stats is not None:
+            stats["guesses"] = stats.get("guesses", 0) + len(words)
+
+        best_key, best_word = score(words, True)
+        ceiling = np.log2(min(len(words), 243))
+        evaluated = 0
+        if best_key[0] < ceiling - 1e-12:
+            remaining = set(words)
+            bounds = ComputeEntropy.entropy_upper_bounds(guess_pool, words)
+            order = [i for i in np.argsort(-bounds, kind="stable") if guess_pool[i] not in remaining]
+            seen = set()  # pattern rows of the classes already scored, across batches
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                # A pool word must be strictly better to displace a candidate
+                if bounds[batch[0]] <= best_key[0] + 1e-12:
+                    break
+                if stats is not None:
+                    stats["guesses"] += len(batch)
+                batch_words = [guess_pool[i] for i in batch]
+                counts = None
+                if collapse:
+                    class_patterns, representatives, _ = ComputeEntropy.collapse_equivalent_guesses(batch_words, words, tie_break)
+                    new = [k for k, row in enumerate(class_patterns) if row.tobytes() not in seen]
+                    seen.update(class_patterns[k].tobytes() for k in new)
+                    if not new:
+                        continue
+                    batch_words = [batch_words[representatives[k]] for k in new]
+                    offsets = np.arange(len(new), dtype=np.int64)[:, None] * 243
+                    counts = np.bincount((class_patterns[new].astype(np.int64) + offsets).ravel(),
+                                         minlength=len(new) * 243).reshape(-1, 243)
+                key, word = score(batch_words, False, counts)
+                evaluated += len(batch_words)
+                if key > best_key:
+                    best_key, best_word = key, word
+        return best_word, best_key[0], evaluated
+
     def compute_entropy_scores(self, words, multi=1):
         """Precompute entropy scores for all words in the dictionary, with optional multiprocessing."""
         if multi == 1:
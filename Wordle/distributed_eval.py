@@ -0,0 +1,238 @@
+import argparse
+import collections
+import json
+import socket
+import socketserver
+import threading
+import time
+from multiprocessing import Process
+import numpy as np
+import wordle_player_optimizer_v1 as optimizer
+
+# Coordinator / worker mode for the weight grid search.
+#
+# The coordinator splits every (weights, seeded answer stream) pair into a work unit and
+# serves units over plain TCP as newline-delimited JSON. Workers on any host connect, play
+# the unit's games with simulate_seeded_block and stream the attempts back. A unit whose
+# worker disconnects, or whose lease expires, is put back on the queue, and late duplicate
+# results are ignored. Because units carry (seed, stream) rather than answers, every
+# configuration still plays the identical answers as in evaluate_weights_seeded.
+#
+#   python distributed_eval.py coordinator --port 5555
+#   python distributed_eval.py worker --host <coordinator> --port 5555 --processes 8
+#   python distributed_eval.py local --workers 4          # single-machine test
+
+DEFAULT_PORT = 5555
+
+class Coordinator:
+    """Work queue of (weights, seed stream) units with leases and re-queuing."""
+
+    def __init__(self, weight_configs, data_hash, num_simulations=50, seed=0, num_streams=optimizer.ANSWER_STREAMS, lease_timeout=900):
+        """data_hash is optimizer.data_hash of the word list and entropy scores; workers must match it."""
+        self.weight_configs = [tuple(float(w) for w in config) for config in weight_configs]
+        self.data_hash = data_hash
+        self.lease_timeout = lease_timeout
+        self.units = {}
+        streams = optimizer.spawn_answer_streams(num_simulations, seed, num_streams)
+        for config_index, weights in enumerate(self.weight_configs):
+            for stream_index, (_, block_size) in enumerate(streams):
+                unit_id = len(self.units)
+                self.units[unit_id] = {"type": "unit", "unit_id": unit_id, "config": config_index, "weights": weights,
+                                       "seed": seed, "stream": stream_index, "block_size": block_size}
+        self.pending = collections.deque(self.units)
+        self.leases = {}  # unit_id -> (owner, leased_at)
+        self.results = {}
+        self.condition = threading.Condition()
+        self.started = time.perf_counter()
+
+    def requeue_expired(self):
+        """Put units whose lease ran out back on the queue (caller holds the lock)."""
+        now = time.monotonic()
+        for unit_id, (_, leased_at) in list(self.leases.items()):
+            if now - leased_at > self.lease_timeout:
+                del self.leases[unit_id]
+                self.pending.append(unit_id)
+                print(f"Unit {unit_id} lease expired; re-queued.")
+
+    def next_unit(self, owner=None):
+        """Lease the next unit to owner, waiting while all remaining units are out; None once everything is done."""
+        with self.condition:
+            while len(self.results) < len(self.units):
+                self.requeue_expired()
+                if self.pending:
+                    unit_id = self.pending.popleft()
+                    if unit_id in self.results:
+                        continue
+                    self.leases[unit_id] = (owner, time.monotonic())
+                    return self.units[unit_id]
+                self.condition.wait(timeout=1.0)
+            return None
+
+    def complete(self, unit_id, attempts):
+        """Record a unit's attempts; duplicates from re-queued units are ignored."""
+        with self.condition:
+            self.leases.pop(unit_id, None)
+            if unit_id not in self.results:
+                self.results[unit_id] = attempts
+                done = len(self.results)
+                if done % 10 == 0 or done == len(self.units):
+                    rate = done / (time.perf_counter() - self.started)
+                    print(f"{done}/{len(self.units)} units complete ({rate:.2f} units/s)")
+            self.condition.notify_all()
+
+    def release(self, unit_id, owner=None):
+        """Re-queue a unit whose worker went away before returning it.
+
+        Only the current lease holder can release a unit: after an expired lease the unit may
+        already be leased again, and the old worker disconnecting must not queue it twice.
+        """
+        with self.condition:
+            if unit_id in self.leases and self.leases[unit_id][0] == owner and unit_id not in self.results:
+                del self.leases[unit_id]
+                self.pending.appendleft(unit_id)
+                print(f"Worker lost unit {unit_id}; re-queued.")
+            self.condition.notify_all()
+
+    def wait(self):
+        """Block until every unit has a result."""
+        with self.condition:
+            while len(self.results) < len(self.units):
+                self.requeue_expired()
+                self.condition.wait(timeout=1.0)
+
+    def summarize(self, fail_penalty=7):
+        """Per-configuration results in the same form as evaluate_weights_seeded."""
+        rows = collections.defaultdict(list)
+        for unit_id in sorted(self.units, key=lambda u: (self.units[u]["config"], self.units[u]["stream"])):
+            rows[self.units[unit_id]["config"]].extend(self.results[unit_id])
+        attempts = np.array([rows[i] for i in range(len(self.weight_configs))])
+        return optimizer.summarize_seeded_attempts(self.weight_configs, attempts, fail_penalty)
+
+    def serve(self, host="0.0.0.0", port=DEFAULT_PORT):
+        """Start the TCP server on a background thread and return it (server_address has the bound port)."""
+        server = socketserver.ThreadingTCPServer((host, port), CoordinatorHandler, bind_and_activate=False)
+        server.allow_reuse_address = True
+        server.daemon_threads = True
+        server.server_bind()
+        server.server_activate()
+        server.coordinator = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """One connection per worker: hello -> unit -> result -> unit ... -> done."""
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        leased = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message["type"] == "hello" and message.get("data_hash") != coordinator.data_hash:
+                    self.send({"type": "error", "reason": "word list or entropy scores mismatch"})
+                    return
+                if message["type"] == "result":
+                    coordinator.complete(message["unit_id"], message["attempts"])
+                    leased = None
+                unit = coordinator.next_unit(self.client_address)
+                if unit is None:
+                    self.send({"type": "done"})
+                    return
+                leased = unit["unit_id"]
+                self.send(unit)
+        except (ConnectionError, ValueError) as e:
+            print(f"Worker connection error: {e}")
+        finally:
+            if leased is not None:
+                coordinator.release(leased, self.client_address)
+
+def run_worker(host, port=DEFAULT_PORT, connect_timeout=60):
+    """Connect to a coordinator and play work units until it reports done."""
+    WORD_LIST, WORD_FREQUENCY, entropy_scores = optimizer.load_data()
+    optimizer.init_worker_entropy()
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(1.0)
+
+    with sock, sock.makefile("rw", encoding="utf-8") as stream:
+        stream.write(json.dumps({"type": "hello", "data_hash": optimizer.data_hash(WORD_LIST, entropy_scores)}) + "\n")
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if message["type"] != "unit":
+                if message["type"] == "error":
+                    print(f"Coordinator refused worker: {message['reason']}")
+                return
+            # Same stream as SeedSequence(seed).spawn(n)[stream] in spawn_answer_streams
+            seed_seq = np.random.SeedSequence(message["seed"], spawn_key=(message["stream"],))
+            w_base, w_positional, w_entropy = message["weights"]
+            attempts = optimizer.simulate_seeded_block((WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy,
+                                                        seed_seq, message["block_size"]))
+            stream.write(json.dumps({"type": "result", "unit_id": message["unit_id"], "attempts": [int(a) for a in attempts]}) + "\n")
+            stream.flush()
+
+def start_workers(host, port, processes):
+    """Start worker processes on this machine."""
+    workers = [Process(target=run_worker, args=(host, port)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def report(results):
+    """Print the per-configuration results, store the winner and return its weights."""
+    for result in results:
+        w_base, w_positional, w_entropy = result["weights"]
+        vs_best = result["vs_best"]
+        print(f"w_base={w_base:.2f}, w_positional={w_positional:.2f}, w_entropy={w_entropy:.2f} -> Avg Guesses: {result['mean_attempts']:.2f} "
+              f"(vs best {vs_best['mean_diff']:+.2f} +/- {1.96 * vs_best['std_err']:.2f})")
+    best = min(results, key=lambda result: result["mean_attempts"])
+    optimizer.store_optimal_weights(*best["weights"])
+    return best["weights"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed weight grid search.")
+    parser.add_argument("mode", choices=["coordinator", "worker", "local"])
+    parser.add_argument("--host", default="127.0.0.1", help="coordinator address (worker mode)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start (worker mode)")
+    parser.add_argument("--workers", type=int, default=4, help="local worker processes (local mode)")
+    parser.add_argument("--num-simulations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid-steps", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    if args.mode == "worker":
+        for worker in start_workers(args.host, args.port, args.processes):
+            worker.join()
+        return
+
+    WORD_LIST, _, entropy_scores = optimizer.load_data()
+    coordinator = Coordinator(optimizer.weight_grid(args.grid_steps), optimizer.data_hash(WORD_LIST, entropy_scores),
+                              num_simulations=args.num_simulations, seed=args.seed)
+    if args.mode == "local":
+        server = coordinator.serve("127.0.0.1", 0)
+        workers = start_workers("127.0.0.1", server.server_address[1], args.workers)
+    else:
+        server = coordinator.serve("0.0.0.0", args.port)
+        workers = []
+    print(f"Coordinator serving {len(coordinator.units)} units on port {server.server_address[1]}")
+
+    coordinator.wait()
+    for worker in workers:
+        worker.join()
+    server.shutdown()
+    return report(coordinator.summarize())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+eval_cache_path = os.path.join(SCRIPT_DIR, "evaluation_cache.sqlite")
+
+class EvaluationCache:
+    """On-disk store of per-game attempts for evaluated weight configurations.
+
+    Rows are keyed by (kind, weights, scoring version, data hash, sample). The scoring version
+    hashes the source of the scoring code and the data hash covers the word list and entropy
+    table, so editing either one simply stops matching old rows: they are never returned for
+    the new code or data. prune() deletes them for good.
+    """
+
+    def __init__(self, path=eval_cache_path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            " kind TEXT, weights TEXT, scoring_version TEXT, data_hash TEXT, sample TEXT,"
+            " attempts BLOB, created REAL,"
+            " PRIMARY KEY (kind, weights, scoring_version, data_hash, sample))")
+        self.connection.commit()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def weights_key(weights):
+        """Stable text form of a weight tuple (rounded so float noise from the grid does not matter)."""
+        return json.dumps([round(float(w), 6) for w in weights])
+
+    @staticmethod
+    def sample_key(**sample):
+        """Stable text form of the sample description (seed range, answer set, selector, ...)."""
+        return json.dumps(sample, sort_keys=True)
+
+    def get(self, kind, weights, scoring_version, data_hash, sample):
+        """Return the cached attempts array, or None."""
+        row = self.connection.execute(
+            "SELECT attempts FROM evaluations WHERE kind=? AND weights=? AND scoring_version=? AND data_hash=? AND sample=?",
+            (kind, self.weights_key(weights), scoring_version, data_hash, sample)).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return np.frombuffer(row[0], dtype=np.int8).astype(np.int64)
+
+    def put(self, kind, weights, scoring_version, data_hash, sample, attempts):
+        """Store the attempts for one configuration; committed immediately so a crash keeps it."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kind, self.weights_key(weights), scoring_version, data_hash, sample,
+             np.asarray(attempts, dtype=np.int8).tobytes(), time.time()))
+        self.connection.commit()
+
+    def prune(self, scoring_version, data_hash):
+        """Delete rows from other scoring versions or data; returns how many were removed."""
+        cursor = self.connection.execute(
+            "DELETE FROM evaluations WHERE scoring_version != ? OR data_hash != ?", (scoring_version, data_hash))
+        self.connection.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import numpy as np
+from compute_entropy import ComputeEntropy
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+histogram_cache_dir = os.path.join(SCRIPT_DIR, "histogram_cache")
+
+###############################################################################
+# METRICS
+# Each takes a (guesses, 243) bucket-count table and reduces it row-wise, so any
+# metric can be computed from a stored table without replaying the patterns.
+###############################################################################
+def entropy(histograms):
+    """Expected information (bits) of each guess."""
+    return ComputeEntropy.entropies_from_histograms(histograms.astype(np.float64))
+
+def expected_remaining(histograms):
+    """Expected number of candidates left after each guess (sum of squared bucket sizes / n)."""
+    counts = histograms.astype(np.float64)
+    return (counts ** 2).sum(axis=1) / counts.sum(axis=1)
+
+def worst_bucket(histograms):
+    """Size of the largest feedback bucket of each guess."""
+    return histograms.max(axis=1)
+
+def solve_next_probability(histograms):
+    """Probability that the guess is the answer (the all-green bucket, pattern index 0)."""
+    counts = histograms.astype(np.float64)
+    return counts[:, 0] / counts.sum(axis=1)
+
+def bucket_count(histograms):
+    """Number of distinct feedback patterns each guess can produce."""
+    return np.count_nonzero(histograms, axis=1)
+
+METRICS = {
+    "entropy": entropy,
+    "expected_remaining": expected_remaining,
+    "worst_bucket": worst_bucket,
+    "solve_next_probability": solve_next_probability,
+    "bucket_count": bucket_count,
+}
+
+###############################################################################
+# STORAGE
+###############################################################################
+def state_key(words):
+    """Order-independent hash of a candidate set, naming its cached table."""
+    return hashlib.sha1("\n".join(sorted(words)).encode("utf-8")).hexdigest()[:16]
+
+def compact(histograms):
+    """Narrow a count table to uint16 when every count fits, otherwise uint32."""
+    return histograms.astype(np.uint16 if histograms.max(initial=0) < 2**16 else np.uint32)
+
+def save_histograms(path, guesses, answers, histograms):
+    """Write a histogram table with the word lists needed to interpret it."""
+    np.savez_compressed(path, guesses=np.asarray(guesses, dtype="<U5"), answers_hash=state_key(answers),
+                        num_answers=len(answers), histograms=compact(histograms))
+
+def load_histograms(path):
+    """Read a table written by save_histograms; returns (guesses, histograms)."""
+    with np.load(path) as data:
+        return [str(word) for word in data["guesses"]], data["histograms"]
+
+class HistogramStore:
+    """Histogram tables for game states, one npz per candidate set, computed once and then reused."""
+
+    def __init__(self, store_dir=histogram_cache_dir):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+    def path_for(self, words):
+        return os.path.join(self.store_dir, f"{state_key(words)}.npz")
+
+    def get_or_compute(self, words, guesses=None):
+        """Return (guesses, histograms) for the state where words are the remaining candidates."""
+        guesses = words if guesses is None else guesses
+        path = self.path_for(words)
+        if os.path.exists(path):
+            stored_guesses, histograms = load_histograms(path)
+            if stored_guesses == list(guesses):
+                return stored_guesses, histograms
+        histograms = ComputeEntropy.compute_pattern_histograms(guesses, words)
+        save_histograms(path, guesses, words, histograms)
+        return list(guesses), compact(histograms)
+
+def metric_scores(guesses, histograms, metric="entropy"):
+    """Map each guess to a metric derived from its stored histogram."""
+    return dict(zip(guesses, METRICS[metric](histograms).tolist()))
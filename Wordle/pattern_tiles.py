@@ -0,0 +1,127 @@
+import collections
+import os
+import time
+import numpy as np
+from compute_entropy import ComputeEntropy
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows; peak RSS is then reported as None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+allowed_words_path = os.path.join(SCRIPT_DIR, "allowed_words.txt")
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where the resource module is missing."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KB on Linux
+
+class TiledPatternEngine:
+    """Guess x answer feedback patterns computed in square tiles on demand.
+
+    The full pattern matrix is never materialized. Tiles are produced by
+    ComputeEntropy.compute_pattern_matrix and kept in an LRU cache whose size is bounded by
+    memory_cap_mb, so entropy and filtering work on dictionaries whose full matrix would not fit.
+    """
+
+    def __init__(self, guesses, answers=None, memory_cap_mb=256, tile_size=2048):
+        """
+        :param guesses: Words that may be guessed (rows).
+        :param answers: Words that may be the answer (columns); defaults to guesses.
+        :param memory_cap_mb: Upper bound on memory held by cached tiles.
+        :param tile_size: Edge length of a tile; one tile takes tile_size**2 bytes.
+        """
+        self.guesses = list(guesses)
+        self.answers = self.guesses if answers is None else list(answers)
+        self.tile_size = tile_size
+        self.max_tiles = max(1, int(memory_cap_mb * 1024 * 1024) // (tile_size * tile_size))
+        self.tiles = collections.OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def tile(self, guess_tile, answer_tile):
+        """Return the pattern block for one (guess tile, answer tile) pair, computing it on a cache miss."""
+        key = (guess_tile, answer_tile)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            self.stats["hits"] += 1
+            return self.tiles[key]
+
+        self.stats["misses"] += 1
+        g0, a0 = guess_tile * self.tile_size, answer_tile * self.tile_size
+        block = ComputeEntropy.compute_pattern_matrix(self.guesses[g0:g0 + self.tile_size], self.answers[a0:a0 + self.tile_size])
+        self.tiles[key] = block
+        if len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+            self.stats["evictions"] += 1
+        return block
+
+    def split_by_tile(self, indices):
+        """Group sorted indices by tile, yielding (tile number, offsets within the tile)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        tile_ids = indices // self.tile_size
+        for tile_id in np.unique(tile_ids):
+            yield int(tile_id), indices[tile_ids == tile_id] - tile_id * self.tile_size
+
+    def histograms(self, candidate_indices=None, guess_indices=None):
+        """Count the candidates in each of the 243 feedback buckets, for every guess (or the given guesses).
+
+        Rows follow the order of guess_indices.
+        """
+        if candidate_indices is None:
+            candidate_indices = np.arange(len(self.answers))
+        if guess_indices is None:
+            guess_indices = np.arange(len(self.guesses))
+        guess_indices = np.asarray(guess_indices, dtype=np.int64)
+        # Tiles are walked in sorted order; order[i] is the input row of the i-th sorted guess
+        order = np.argsort(guess_indices, kind="stable")
+        guess_indices = guess_indices[order]
+        candidate_groups = list(self.split_by_tile(np.sort(candidate_indices)))
+
+        counts = np.zeros((len(guess_indices), 243), dtype=np.int64)
+        row = 0
+        for guess_tile, guess_offsets in self.split_by_tile(guess_indices):
+            offsets = np.arange(len(guess_offsets), dtype=np.int64)[:, None] * 243
+            for answer_tile, answer_offsets in candidate_groups:
+                block = self.tile(guess_tile, answer_tile)[np.ix_(guess_offsets, answer_offsets)]
+                counts[row:row + len(guess_offsets)] += np.bincount(
+                    (block + offsets).ravel(), minlength=len(guess_offsets) * 243).reshape(-1, 243)
+            row += len(guess_offsets)
+        result = np.empty_like(counts)
+        result[order] = counts
+        return result
+
+    def entropy_scores(self, candidate_indices=None, guess_indices=None):
+        """Entropy (bits) of the feedback distribution over the candidates, per guess."""
+        return ComputeEntropy.entropies_from_histograms(self.histograms(candidate_indices, guess_indices))
+
+    def filter(self, candidate_indices, guess_index, pattern_index):
+        """Return the candidates that would produce pattern_index for the given guess."""
+        guess_tile, guess_offset = divmod(int(guess_index), self.tile_size)
+        keep = []
+        for answer_tile, answer_offsets in self.split_by_tile(np.sort(candidate_indices)):
+            row = self.tile(guess_tile, answer_tile)[guess_offset, answer_offsets]
+            keep.append(answer_offsets[row == pattern_index] + answer_tile * self.tile_size)
+        return np.concatenate(keep) if keep else np.empty(0, dtype=np.int64)
+
+    def report(self):
+        """Tile cache statistics plus the peak RSS of the run so far."""
+        return dict(self.stats, cached_tiles=len(self.tiles), max_tiles=self.max_tiles, peak_rss_mb=peak_rss_mb())
+
+def run_full_entropy(word_path=allowed_words_path, memory_cap_mb=256, tile_size=2048):
+    """Score every word in word_path against the whole list within the memory cap and print the run report."""
+    with open(word_path) as f:
+        words = [word.strip() for word in f if len(word.strip()) == 5]
+    engine = TiledPatternEngine(words, memory_cap_mb=memory_cap_mb, tile_size=tile_size)
+
+    start = time.perf_counter()
+    scores = engine.entropy_scores()
+    elapsed = time.perf_counter() - start
+    best = int(np.argmax(scores))
+    print(f"Scored {len(words)} guesses x {len(words)} answers in {elapsed:.2f}s; best first guess {words[best]} ({scores[best]:.3f} bits)")
+    print(f"Run report: {engine.report()}")
+    return engine, scores
+
+if __name__ == "__main__":
+    run_full_entropy()
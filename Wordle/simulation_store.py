@@ -0,0 +1,119 @@
+import json
+import os
+import numpy as np
+
+MAX_GUESSES = 6
+
+class SimulationStore:
+    """Append-only columnar store for simulated games.
+
+    Each call to append() writes one compressed npz shard holding the answer, guesses,
+    attempts and timing columns for a batch of games, and folds the batch into a small
+    summary.json (games per attempt count, failures, total time). Histograms and summary
+    statistics are served from summary.json, so they never rescan the shards.
+    """
+
+    SUMMARY_FILE = "summary.json"
+
+    def __init__(self, store_dir):
+        """Open (or create) the store rooted at store_dir."""
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.summary_path = os.path.join(store_dir, self.SUMMARY_FILE)
+        self.summary = self.load_summary()
+
+    def load_summary(self):
+        """Load the running summary, or start an empty one."""
+        if os.path.exists(self.summary_path):
+            with open(self.summary_path, "r") as f:
+                return json.load(f)
+        return {
+            "num_games": 0,
+            "failures": 0,
+            "attempt_counts": [0] * (MAX_GUESSES + 1),  # index 0 counts failed games
+            "total_seconds": 0.0,
+            "num_shards": 0,
+        }
+
+    def clear(self):
+        """Delete every shard and reset the summary, leaving an empty store."""
+        for name in os.listdir(self.store_dir):
+            if name.startswith("shard_") and name.endswith(".npz"):
+                os.remove(os.path.join(self.store_dir, name))
+        if os.path.exists(self.summary_path):
+            os.remove(self.summary_path)
+        self.summary = self.load_summary()
+
+    def write_summary(self):
+        """Atomically replace summary.json so a crash never leaves it half written."""
+        tmp_path = self.summary_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.summary, f, indent=2)
+        os.replace(tmp_path, self.summary_path)
+
+    def append(self, answers, guesses, attempts, seconds):
+        """Write one shard for a batch of games and update the running summary.
+
+        answers : list of answer words
+        guesses : list of guess lists (up to six words each)
+        attempts : list of attempt counts (0 marks a failed game)
+        seconds : list of per-game solve times
+        """
+        if not answers:
+            return
+        guess_matrix = np.full((len(guesses), MAX_GUESSES), "", dtype="<U5")
+        for row, game_guesses in enumerate(guesses):
+            guess_matrix[row, :len(game_guesses)] = game_guesses
+        attempts = np.asarray(attempts, dtype=np.int8)
+        seconds = np.asarray(seconds, dtype=np.float32)
+
+        shard_path = os.path.join(self.store_dir, f"shard_{self.summary['num_shards']:05d}.npz")
+        np.savez_compressed(shard_path, answer=np.asarray(answers, dtype="<U5"), guesses=guess_matrix,
+                            attempts=attempts, seconds=seconds)
+
+        counts = np.bincount(attempts, minlength=MAX_GUESSES + 1)
+        self.summary["attempt_counts"] = [int(a + b) for a, b in zip(self.summary["attempt_counts"], counts)]
+        self.summary["num_games"] += len(attempts)
+        self.summary["failures"] += int(counts[0])
+        self.summary["total_seconds"] += float(seconds.sum())
+        self.summary["num_shards"] += 1
+        self.write_summary()
+
+    def iter_shards(self, columns=None):
+        """Yield the shards in write order as dicts of column arrays (optionally only some columns)."""
+        for shard in range(self.summary["num_shards"]):
+            shard_path = os.path.join(self.store_dir, f"shard_{shard:05d}.npz")
+            with np.load(shard_path) as data:
+                yield {name: data[name] for name in (columns or data.files)}
+
+    def solved_counts(self):
+        """Return the number of solved games for attempts 1..6 as an array."""
+        return np.asarray(self.summary["attempt_counts"][1:], dtype=np.int64)
+
+    def describe(self):
+        """Summary statistics computed from the aggregates alone."""
+        counts = self.solved_counts()
+        attempts = np.arange(1, MAX_GUESSES + 1)
+        solved = int(counts.sum())
+        num_games = self.summary["num_games"]
+        return {
+            "num_games": num_games,
+            "failures": self.summary["failures"],
+            "failure_rate": self.summary["failures"] / num_games if num_games else 0.0,
+            "mean_attempts": float((counts * attempts).sum() / solved) if solved else float("inf"),
+            "median_attempts": median_from_counts(counts, attempts) if solved else float("inf"),
+            "max_attempts": int(attempts[counts > 0].max()) if solved else 0,
+            "games_per_second": num_games / self.summary["total_seconds"] if self.summary["total_seconds"] else 0.0,
+        }
+
+def median_from_counts(counts, values):
+    """Median of a sample given as value counts, without expanding it."""
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+    upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+    return float(lower + upper) / 2
+
+def compare_stores(*store_dirs):
+    """Return describe() for several stores, keyed by directory, for side-by-side comparison."""
+    return {store_dir: SimulationStore(store_dir).describe() for store_dir in store_dirs}
@@ -0,0 +1,125 @@
+import time
+
+START_TIME = time.perf_counter()
+
+import argparse
+
+# Single entry point for the Wordle tools:
+#   python wordle.py play | simulate | optimize | precompute | bench
+# Each subcommand imports its module (and loads its data) only when it runs,
+# so the interactive player does not pay for numpy-heavy or plotting code it never uses.
+
+def cmd_play(args):
+    """Play interactively with the solver (world_player_v1)."""
+    import world_player_v1 as player
+    from compute_entropy import ComputeEntropy
+
+    player.load_data()
+    player.compute_entropy_instance = ComputeEntropy()
+    guess_pool = player.load_guess_pool() if args.full_pool else None
+    player.wordle_solver(start_time=START_TIME, guess_pool=guess_pool)
+
+def cmd_simulate(args):
+    """Simulate games into the columnar result store and plot the histogram."""
+    import wordle_simulator_v1 as simulator
+    from compute_entropy import ComputeEntropy
+
+    WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy = simulator.load_data()
+    simulator.compute_entropy_instance = ComputeEntropy()
+    store = simulator.store_simulation_results(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy,
+                                               num_simulations=args.num_simulations, append=args.append)
+    if not args.no_plot:
+        simulator.generate_histogram(store.store_dir)
+
+def cmd_optimize(args):
+    """Grid-search the scoring weights."""
+    import wordle_player_optimizer_v1 as optimizer
+    from compute_entropy import ComputeEntropy
+
+    WORD_LIST, WORD_FREQUENCY, entropy_scores = optimizer.load_data()
+    optimizer.compute_entropy_instance = ComputeEntropy()
+    cache_path = None if args.no_cache else optimizer.eval_cache_path
+    optimizer.optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores, objective=args.objective,
+                               seed=None if args.random else args.seed, cache_path=cache_path)
+
+def cmd_precompute(args):
+    """Precompute the first-guess entropy table."""
+    import precompute_entropy
+
+    precompute_entropy.precompute_entropy_scores()
+
+def cmd_bench(args):
+    """Time the start-up path and the guess selectors on the current word list."""
+    import world_player_v1 as player
+    import wordle_player_optimizer_v1 as optimizer
+    from compute_entropy import ComputeEntropy
+
+    print(f"imports: {time.perf_counter() - START_TIME:.3f}s since start")
+
+    start = time.perf_counter()
+    WORD_LIST, _, entropy_scores, _, _, _ = player.load_data()
+    print(f"load_data: {time.perf_counter() - start:.3f}s ({len(WORD_LIST)} words)")
+
+    start = time.perf_counter()
+    guess = player.best_guess(WORD_LIST, 6, entropy_scores)
+    print(f"best_guess (first turn): {time.perf_counter() - start:.3f}s -> {guess}")
+
+    words = WORD_LIST[:args.num_words]
+    start = time.perf_counter()
+    ComputeEntropy.compute_pattern_histograms(words, words)
+    print(f"pattern histograms {len(words)}x{len(words)}: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    guess = optimizer.minimax_guess(words)
+    print(f"minimax_guess ({len(words)} words): {time.perf_counter() - start:.3f}s -> {guess}")
+
+    # Later turns of a sample game: full-pool search with equivalent guesses collapsed
+    answer = args.answer or WORD_LIST[len(WORD_LIST) // 2]
+    guess = player.best_guess(WORD_LIST, 6, entropy_scores)
+    candidates = WORD_LIST
+    guess_pool = player.load_guess_pool()
+    for turn in range(2, 6):
+        result = "".join("G" if guess[i] == answer[i] else ("Y" if guess[i] in answer else "B") for i in range(5))
+        candidates = player.filter_words(candidates, guess, result)
+        if len(candidates) <= 2:
+            break
+        stats = {}
+        start = time.perf_counter()
+        guess, _, _ = ComputeEntropy.best_entropy_guess(candidates, guess_pool, collapse=True, stats=stats)
+        print(f"turn {turn} full-pool guess ({len(candidates)} candidates): {time.perf_counter() - start:.3f}s -> {guess}; "
+              f"equivalence classes: {stats['classes']} scored for {stats['guesses']} guesses "
+              f"({1 - stats['classes'] / stats['guesses']:.1%} of histograms saved)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="wordle", description="Wordle solver, simulator and optimizer.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    play = subparsers.add_parser("play", help=cmd_play.__doc__)
+    play.add_argument("--full-pool", action="store_true", help="search every allowed word, not just remaining candidates")
+    play.set_defaults(func=cmd_play)
+
+    simulate = subparsers.add_parser("simulate", help=cmd_simulate.__doc__)
+    simulate.add_argument("-n", "--num-simulations", type=int, default=200)
+    simulate.add_argument("--append", action="store_true", help="add to the earlier games of the same weights and data instead of starting over")
+    simulate.add_argument("--no-plot", action="store_true", help="skip the histogram (and the matplotlib import)")
+    simulate.set_defaults(func=cmd_simulate)
+
+    optimize = subparsers.add_parser("optimize", help=cmd_optimize.__doc__)
+    optimize.add_argument("--objective", choices=["mean", "worst"], default="mean")
+    optimize.add_argument("--seed", type=int, default=0, help="seed of the answer sample every weight is evaluated on (default 0)")
+    optimize.add_argument("--random", action="store_true", help="draw a fresh unseeded sample per weight (never cached)")
+    optimize.add_argument("--no-cache", action="store_true", help="do not read or write the evaluation cache")
+    optimize.set_defaults(func=cmd_optimize)
+
+    subparsers.add_parser("precompute", help=cmd_precompute.__doc__).set_defaults(func=cmd_precompute)
+
+    bench = subparsers.add_parser("bench", help=cmd_bench.__doc__)
+    bench.add_argument("--num-words", type=int, default=2000, help="word list size for the vectorized benchmarks")
+    bench.add_argument("--answer", default=None, help="answer for the sample game (default: middle of the word list)")
+    bench.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,14 @@ import collections
 import itertools
 import random
 import csv
+import hashlib
+import inspect
+import json
 import os
-import matplotlib.pyplot as plt
 import numpy as np
 from multiprocessing import Pool, cpu_count
 from compute_entropy import ComputeEntropy
+from eval_cache import EvaluationCache, eval_cache_path
 
 # Get the directory of the current script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,6 +18,10 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 word_list_path = os.path.join(SCRIPT_DIR, "wordlist_5.csv")
 word_freq_path = os.path.join(SCRIPT_DIR, "word_frequencies.txt")
 entropy_path = os.path.join(SCRIPT_DIR, "entropy_scores.csv")
+allowed_words_path = os.path.join(SCRIPT_DIR, "allowed_words.txt")
+
+compute_entropy_instance = None  # Set in __main__ or per worker by init_worker_entropy
+ANSWER_STREAMS = 16  # Independent answer streams per seeded evaluation (one block of games each)
 
 def load_data():
     global WORD_LIST, WORD_FREQUENCY, entropy_scores
@@ -47,6 +54,23 @@ def load_data():
     
     return WORD_LIST, WORD_FREQUENCY, entropy_scores
 
+def word_list_hash(WORD_LIST):
+    """Short content hash of a word list, used to check that results were produced on the same words."""
+    return hashlib.sha1("\n".join(WORD_LIST).encode("utf-8")).hexdigest()[:16]
+
+def data_hash(WORD_LIST, entropy_scores):
+    """Hash of the inputs an evaluation depends on: the word list and the precomputed entropy table."""
+    digest = hashlib.sha1(word_list_hash(WORD_LIST).encode("utf-8"))
+    digest.update(json.dumps(sorted(entropy_scores.items())).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def scoring_version():
+    """Hash of the source code that decides which guesses get played, used to invalidate cached evaluations."""
+    functions = (filter_words, get_letter_frequencies, compute_positional_frequencies, score_word, best_guess,
+                 minimax_guess, load_guess_pool, simulate_game, simulate_seeded_block, ComputeEntropy)
+    source = "".join(inspect.getsource(function) for function in functions)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
 def filter_words(words, guess, result):
     """Filter words based on feedback from Wordle (G = green, Y = yellow, B = black/gray)."""
     new_words = []
@@ -126,32 +150,63 @@ def best_guess(words, remaining_guesses, entropy_scores, last_feedback=None, w_b
     
 #     return total_attempts / valid_simulations if valid_simulations > 0 else float('inf')  # Avoid division by zero
 
-def simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base=0.4, w_positional=0.4, w_entropy = 0.2):
-    """Simulate a game of Wordle by selecting a random word and solving it."""
+def minimax_guess(words, guess_pool=None):
+    """Return the guess whose largest feedback bucket over the remaining words is smallest."""
+    guess_pool = words if guess_pool is None else guess_pool
+    max_buckets = ComputeEntropy.compute_pattern_histograms(guess_pool, words).max(axis=1)
+    return guess_pool[int(np.argmin(max_buckets))]
+
+def load_guess_pool(path=allowed_words_path):
+    """Load the full dictionary of allowed guesses, including words that can no longer be the answer."""
+    with open(path) as f:
+        return [word.strip() for word in f if len(word.strip()) == 5]
+
+def simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base=0.4, w_positional=0.4, w_entropy = 0.2, answer=None, selector="score", guess_pool=None):
+    """Simulate a game of Wordle by selecting a random word (or the given answer) and solving it.
+
+    selector="score" picks guesses with the weighted score_word heuristic,
+    selector="minimax" picks the guess that minimizes the largest feedback bucket,
+    selector="full_pool" plays the first scored guess, then the highest-entropy word from
+    guess_pool (default: allowed_words.txt), which may already be eliminated.
+    """
     global compute_entropy_instance
 
     if compute_entropy_instance is None:
         compute_entropy_instance = ComputeEntropy()  # ✅ Instantiate correctly
 
-    answer = random.choice(WORD_LIST)
+    if answer is None:
+        answer = random.choice(WORD_LIST)
     words = WORD_LIST.copy()
     remaining_guesses = 6
     guesses = []
     for _ in range(6):
-        guess = best_guess(words, remaining_guesses, entropy_scores, w_base=w_base, w_positional=w_positional,  w_entropy= w_entropy)
+        if selector == "minimax":
+            guess = minimax_guess(words)
+        elif selector == "full_pool" and remaining_guesses != 6:
+            if guess_pool is None:
+                guess_pool = load_guess_pool()
+            guess = ComputeEntropy.best_entropy_guess(words, guess_pool)[0]
+        else:
+            guess = best_guess(words, remaining_guesses, entropy_scores, w_base=w_base, w_positional=w_positional,  w_entropy= w_entropy)
         remaining_guesses -= 1
         guesses.append(guess)
         if guess == answer:
             return answer, guesses, len(guesses)
         result = "".join("G" if guess[i] == answer[i] else ("Y" if guess[i] in answer else "B") for i in range(5))
         words = filter_words(words, guess, result)
-        entropy_scores = compute_entropy_instance.compute_entropy_scores(words, multi = 0)
+        if selector == "score":
+            entropy_scores = compute_entropy_instance.compute_entropy_scores(words, multi = 0)
     return answer, guesses, 0  # 0 indicates failure
 
 def simulate(args):
     """Run a single game simulation and return the number of attempts."""
     return simulate_game(*args)[2]  # Return only the number of attempts
 
+def simulate_answer(args):
+    """Run a single game against a fixed answer and return (answer, attempts)."""
+    answer, _, attempts = simulate_game(*args)
+    return answer, attempts
+
 def init_worker_entropy():
     """Initialize compute_entropy_instance for multiprocessing workers."""
     global compute_entropy_instance
@@ -166,6 +221,112 @@ def evaluate_weights_parallel(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base,
     valid_attempts = [a for a in attempts if a > 0]
     return sum(valid_attempts) / len(valid_attempts) if valid_attempts else float('inf')
 
+def evaluate_weights_worst_case(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, answers=None, selector="score", cache=None):
+    """Play every answer once and report the worst case of the policy instead of the mean.
+
+    Returns a dict with the deepest solve (max_attempts), the answers that were not solved
+    within six guesses (failed_answers), the mean over solved games and the number of games.
+    With an EvaluationCache, a configuration already played on the same answers is not replayed.
+    """
+    answers = WORD_LIST if answers is None else answers
+    weights = (w_base, w_positional, w_entropy)
+    if cache is not None:
+        cache_key = ("worst", weights, scoring_version(), data_hash(WORD_LIST, entropy_scores),
+                     EvaluationCache.sample_key(answers=word_list_hash(answers), selector=selector))
+        attempts = cache.get(*cache_key)
+    if cache is None or attempts is None:
+        with Pool(cpu_count(), initializer=init_worker_entropy, initargs=()) as pool:
+            results = pool.map(simulate_answer, [(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, answer, selector) for answer in answers], chunksize=16)
+        attempts = [a for _, a in results]
+        if cache is not None:
+            cache.put(*cache_key, attempts)
+
+    solved = [int(a) for a in attempts if a > 0]
+    failed_answers = [answer for answer, a in zip(answers, attempts) if a == 0]
+    return {
+        "max_attempts": max(solved) if solved else 0,
+        "failed_answers": failed_answers,
+        "mean_attempts": sum(solved) / len(solved) if solved else float('inf'),
+        "num_games": len(attempts),
+    }
+
+def spawn_answer_streams(num_simulations, seed=0, num_streams=ANSWER_STREAMS):
+    """Split num_simulations games into per-worker blocks, each with its own SeedSequence-spawned stream.
+
+    The same seed always yields the same (stream, block size) pairs, so every configuration
+    evaluated with them plays the identical answers (common random numbers). The number of
+    streams is fixed rather than tied to cpu_count() so the sample is the same on every machine.
+    """
+    num_streams = min(num_streams, num_simulations)
+    children = np.random.SeedSequence(seed).spawn(num_streams)
+    block_sizes = [len(block) for block in np.array_split(np.arange(num_simulations), num_streams)]
+    return list(zip(children, block_sizes))
+
+def simulate_seeded_block(args):
+    """Play a block of games whose answers are drawn from a dedicated random stream."""
+    WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, seed_seq, block_size = args
+    rng = np.random.default_rng(seed_seq)
+    answers = rng.choice(len(WORD_LIST), size=block_size)
+    return [simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, answer=WORD_LIST[i])[2] for i in answers]
+
+def paired_difference_stats(attempts_a, attempts_b):
+    """Mean, standard error and 95% interval of the per-game difference a - b on a shared answer sample."""
+    diff = np.asarray(attempts_a, dtype=float) - np.asarray(attempts_b, dtype=float)
+    mean_diff = float(diff.mean())
+    std_err = float(diff.std(ddof=1) / np.sqrt(len(diff))) if len(diff) > 1 else float('inf')
+    return {"mean_diff": mean_diff, "std_err": std_err, "ci95": (mean_diff - 1.96 * std_err, mean_diff + 1.96 * std_err)}
+
+def evaluate_weights_seeded(WORD_LIST, WORD_FREQUENCY, entropy_scores, weight_configs, num_simulations=50, seed=0, fail_penalty=7, cache=None):
+    """Evaluate several (w_base, w_positional, w_entropy) configurations on the identical seeded answer sample.
+
+    Failed games count as fail_penalty guesses so every configuration is scored on every game.
+    Each result holds mean_attempts, failures and the paired difference to the best configuration;
+    pairing removes the answer-to-answer variance that dominates unpaired comparisons.
+    With an EvaluationCache, configurations already measured on this sample are read back, and
+    each new configuration is stored as soon as its games finish, so an interrupted sweep resumes.
+    """
+    streams = spawn_answer_streams(num_simulations, seed)
+    rows = {}
+    if cache is not None:
+        version, inputs_hash = scoring_version(), data_hash(WORD_LIST, entropy_scores)
+        sample = EvaluationCache.sample_key(seed=seed, num_simulations=num_simulations, streams=len(streams))
+        for i, weights in enumerate(weight_configs):
+            cached = cache.get("seeded", weights, version, inputs_hash, sample)
+            if cached is not None:
+                rows[i] = cached
+
+    todo = [i for i in range(len(weight_configs)) if i not in rows]
+    if todo:
+        tasks = [(WORD_LIST, WORD_FREQUENCY, entropy_scores, *weight_configs[i], seed_seq, block_size)
+                 for i in todo for seed_seq, block_size in streams]
+        blocks, configs_left = [], iter(todo)
+        with Pool(cpu_count(), initializer=init_worker_entropy, initargs=()) as pool:
+            for block in pool.imap(simulate_seeded_block, tasks):
+                blocks.append(block)
+                if len(blocks) == len(streams):
+                    i = next(configs_left)
+                    rows[i] = np.concatenate(blocks)
+                    blocks = []
+                    if cache is not None:
+                        cache.put("seeded", weight_configs[i], version, inputs_hash, sample, rows[i])
+
+    attempts = np.array([rows[i] for i in range(len(weight_configs))])
+    return summarize_seeded_attempts(weight_configs, attempts, fail_penalty)
+
+def summarize_seeded_attempts(weight_configs, attempts, fail_penalty=7):
+    """Turn a (configs, games) attempts matrix played on shared answers into per-configuration results."""
+    attempts = np.asarray(attempts)
+    failures = (attempts == 0).sum(axis=1)
+    attempts = np.where(attempts == 0, fail_penalty, attempts)
+    means = attempts.mean(axis=1)
+    best = int(np.argmin(means))
+
+    return [{
+        "weights": config,
+        "mean_attempts": float(means[i]),
+        "failures": int(failures[i]),
+        "vs_best": paired_difference_stats(attempts[i], attempts[best]),
+    } for i, config in enumerate(weight_configs)]
 
 def store_optimal_weights(w_base, w_positional, w_entropy):
     """Store the optimal weights in a file."""
@@ -176,23 +337,60 @@ def store_optimal_weights(w_base, w_positional, w_entropy):
         f.write(f"w_entropy={w_entropy:.2f}\n")
     print(f"Optimal weights saved to {weights_path}")
 
-def optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores):
-    """Optimize the weighting of base score, positional score, and entropy using Grid Search."""
+# Seed of the default answer sample; a fixed value lets default runs reuse the evaluation cache
+DEFAULT_SEED = 0
+
+def weight_grid(steps=11):
+    """All (w_base, w_positional, w_entropy) combinations on a regular grid that sum to one."""
+    weight_range = np.linspace(0, 1, steps)
+    return [(w_base, w_positional, 1 - (w_base + w_positional))
+            for w_base in weight_range for w_positional in weight_range if 1 - (w_base + w_positional) >= 0]
+
+def optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores, objective="mean", seed=DEFAULT_SEED, cache_path=eval_cache_path):
+    """Optimize the weighting of base score, positional score, and entropy using Grid Search.
+
+    objective="mean" minimizes the average guesses over random games, objective="worst" plays
+    every answer and minimizes (number of failures, deepest solve, average guesses) in that order.
+    The mean objective evaluates every configuration on the same answer sample drawn from seed
+    (DEFAULT_SEED unless given), so a rerun, refinement or restart reuses its evaluations.
+    Seeded and worst-case evaluations are reused from the cache at cache_path (None disables it);
+    seed=None draws a fresh random sample per configuration, which is never cached.
+    """
+    cache = EvaluationCache(cache_path) if cache_path is not None else None
     best_w_base, best_w_positional, best_w_entropy = 0, 0, 0
     best_avg_guesses = float('inf')
-    weight_range = np.linspace(0, 1, 11)
-    
-    for w_base in weight_range:
-        for w_positional in weight_range:
-            w_entropy = 1 - (w_base + w_positional)
-            if w_entropy < 0:
-                continue
-            avg_guesses = evaluate_weights_parallel(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, num_simulations=50)
-            print(f"Testing w_base={w_base:.2f}, w_positional={w_positional:.2f}, w_entropy={w_entropy:.2f} -> Avg Guesses: {avg_guesses:.2f}")
-            if avg_guesses < best_avg_guesses:
+    best_key = (float('inf'),)
+    weight_configs = weight_grid()
+
+    if seed is not None and objective == "mean":
+        results = evaluate_weights_seeded(WORD_LIST, WORD_FREQUENCY, entropy_scores, weight_configs, num_simulations=50, seed=seed, cache=cache)
+        for result in results:
+            w_base, w_positional, w_entropy = result["weights"]
+            vs_best = result["vs_best"]
+            print(f"Testing w_base={w_base:.2f}, w_positional={w_positional:.2f}, w_entropy={w_entropy:.2f} -> Avg Guesses: {result['mean_attempts']:.2f} "
+                  f"(vs best {vs_best['mean_diff']:+.2f}, 95% CI {vs_best['ci95'][0]:+.2f}..{vs_best['ci95'][1]:+.2f})")
+        best = min(results, key=lambda result: result["mean_attempts"])
+        best_avg_guesses = best["mean_attempts"]
+        best_w_base, best_w_positional, best_w_entropy = best["weights"]
+    else:
+        for w_base, w_positional, w_entropy in weight_configs:
+            if objective == "worst":
+                worst = evaluate_weights_worst_case(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, cache=cache)
+                avg_guesses = worst["mean_attempts"]
+                key = (len(worst["failed_answers"]), worst["max_attempts"], avg_guesses)
+                print(f"Testing w_base={w_base:.2f}, w_positional={w_positional:.2f}, w_entropy={w_entropy:.2f} -> Failures: {key[0]}, Max Guesses: {key[1]}, Avg Guesses: {avg_guesses:.2f}")
+            else:
+                avg_guesses = evaluate_weights_parallel(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, num_simulations=50)
+                key = (avg_guesses,)
+                print(f"Testing w_base={w_base:.2f}, w_positional={w_positional:.2f}, w_entropy={w_entropy:.2f} -> Avg Guesses: {avg_guesses:.2f}")
+            if key < best_key:
+                best_key = key
                 best_avg_guesses = avg_guesses
                 best_w_base, best_w_positional, best_w_entropy = w_base, w_positional, w_entropy
     
+    if cache is not None:
+        print(f"Evaluation cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses ({cache.path})")
+        cache.close()
     print(f"Optimal Weights: w_base={best_w_base:.2f}, w_positional={best_w_positional:.2f}, w_entropy={best_w_entropy:.2f} with {best_avg_guesses:.2f} guesses on average")
     store_optimal_weights(best_w_base, best_w_positional, best_w_entropy)
     return best_w_base, best_w_positional, best_w_entropy
@@ -200,5 +398,5 @@ def optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores):
 if __name__ == "__main__":
     WORD_LIST, WORD_FREQUENCY, entropy_scores = load_data()
     compute_entropy_instance = ComputeEntropy()  # ✅ Initialize globally
-    best_w_base, best_w_positional, best_w_entropy = optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores)
+    best_w_base, best_w_positional, best_w_entropy = optimize_weights(WORD_LIST, WORD_FREQUENCY, entropy_scores, seed=DEFAULT_SEED)
     print(f"Optimized weights: w_base={best_w_base}, w_positional={best_w_positional}, w_entropy={best_w_entropy}")
@@ -2,10 +2,12 @@ import collections
 import itertools
 import random
 import csv
+import hashlib
 import os
-import matplotlib.pyplot as plt
+import time
 import numpy as np
 from compute_entropy import ComputeEntropy
+from simulation_store import SimulationStore, median_from_counts
 from multiprocessing import Pool, cpu_count
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -14,6 +16,8 @@ word_list_path = os.path.join(SCRIPT_DIR, "wordlist_5.csv")
 word_freq_path = os.path.join(SCRIPT_DIR, "word_frequencies.txt")
 entropy_path = os.path.join(SCRIPT_DIR, "entropy_scores.csv")
 weights_path = os.path.join(SCRIPT_DIR, "optimal_weights.txt")
+results_path = os.path.join(SCRIPT_DIR, "simulation_results")
+legacy_results_path = os.path.join(SCRIPT_DIR, "simulation_results.csv")
 
 def load_data():
     global WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy
@@ -140,39 +144,69 @@ def simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base=0.4, w_posit
 #     valid_attempts = [a for a in attempts if a > 0]
 #     return sum(valid_attempts) / len(valid_attempts) if valid_attempts else float('inf')
 
-def store_simulation_results(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base=0.4, w_positional=0.4, w_entropy = 0.2, filename="simulation_results.csv", num_simulations=100):
-    """Run multiple simulations and store results in a CSV file."""
-    with open(filename, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["answer", "guess1", "guess2", "guess3", "guess4", "guess5", "guess6", "attempts"])
-        for _ in range(num_simulations):
-            answer, guesses, attempts = simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy)
-            row = [answer] + guesses + ["" for _ in range(6 - len(guesses))] + [attempts]
-            writer.writerow(row)
-
-def generate_histogram():
-    """Generate a histogram of the number of attempts required to solve Wordle."""
-    results_path = os.path.join(SCRIPT_DIR, "simulation_results.csv")
-    if not os.path.exists(results_path):
-        print("Error: simulation_results.csv not found.")
-        return
-    
-    attempts = []
-    with open(results_path, "r") as csvfile:
+def run_dir(WORD_LIST, entropy_scores, w_base, w_positional, w_entropy, results_dir=results_path):
+    """Store directory for one configuration: results_dir/run_<hash of the weights, word list and entropy scores>."""
+    digest = hashlib.sha1(repr((w_base, w_positional, w_entropy)).encode("utf-8"))
+    digest.update("\n".join(WORD_LIST).encode("utf-8"))
+    digest.update(repr(sorted(entropy_scores.items())).encode("utf-8"))
+    return os.path.join(results_dir, f"run_{digest.hexdigest()[:12]}")
+
+def store_simulation_results(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base=0.4, w_positional=0.4, w_entropy = 0.2, results_dir=results_path, num_simulations=100, batch_size=1000, append=False):
+    """Run multiple simulations into the store for this configuration (see run_dir), one shard per batch.
+
+    Runs with different weights or data never share a store. The store is emptied first unless
+    append=True, which adds the games to those of earlier runs of the same configuration.
+    """
+    store = SimulationStore(run_dir(WORD_LIST, entropy_scores, w_base, w_positional, w_entropy, results_dir))
+    if not append:
+        store.clear()
+    answers, guess_lists, attempt_list, seconds = [], [], [], []
+    for n in range(num_simulations):
+        start = time.perf_counter()
+        answer, guesses, attempts = simulate_game(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy)
+        seconds.append(time.perf_counter() - start)
+        answers.append(answer)
+        guess_lists.append(guesses)
+        attempt_list.append(attempts)
+        if len(answers) == batch_size or n == num_simulations - 1:
+            store.append(answers, guess_lists, attempt_list, seconds)
+            answers, guess_lists, attempt_list, seconds = [], [], [], []
+    return store
+
+def load_legacy_counts(csv_path):
+    """Build per-attempt counts from an old one-row-per-game simulation_results.csv."""
+    counts = np.zeros(7, dtype=np.int64)
+    with open(csv_path, "r") as csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
-            if int(row["attempts"]) > 0:  # Exclude failed games
-                attempts.append(int(row["attempts"]))
-    
-    if not attempts:
+            counts[int(row["attempts"])] += 1
+    return counts[1:]
+
+def generate_histogram(results_dir=results_path):
+    """Generate a histogram of the number of attempts required to solve Wordle from the store summary.
+
+    results_dir is one run's store (store_simulation_results(...).store_dir); the legacy CSV is used when it has no summary.
+    """
+    import matplotlib.pyplot as plt  # Imported here so simulation-only runs skip the matplotlib start-up cost
+
+    if os.path.exists(os.path.join(results_dir, SimulationStore.SUMMARY_FILE)):
+        counts = SimulationStore(results_dir).solved_counts()
+    elif os.path.exists(legacy_results_path):
+        counts = load_legacy_counts(legacy_results_path)
+    else:
+        print(f"Error: no simulation results found in {results_dir}.")
+        return
+
+    if not counts.sum():
         print("No valid attempts found in the results.")
         return
-    
-    mean_attempts = np.mean(attempts)
-    median_attempts = np.median(attempts)
-    
+
+    attempts = np.arange(1, 7)
+    mean_attempts = (counts * attempts).sum() / counts.sum()
+    median_attempts = median_from_counts(counts, attempts)
+
     plt.figure(figsize=(8, 6))
-    plt.hist(attempts, bins=range(1, 8), edgecolor='black', alpha=0.7)
+    plt.bar(attempts, counts, width=1.0, align='edge', edgecolor='black', alpha=0.7)
     plt.axvline(mean_attempts, color='red', linestyle='dashed', linewidth=2, label=f'Mean: {mean_attempts:.2f}')
     plt.axvline(median_attempts, color='blue', linestyle='dashed', linewidth=2, label=f'Median: {median_attempts:.2f}')
     plt.xlabel("Number of Attempts")
@@ -188,5 +222,5 @@ def generate_histogram():
 if __name__ == "__main__":
     WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy = load_data()
     compute_entropy_instance = ComputeEntropy()  # ✅ Initialize globally
-    store_simulation_results(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, num_simulations=200)
-    generate_histogram()
+    store = store_simulation_results(WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, num_simulations=200)
+    generate_histogram(store.store_dir)
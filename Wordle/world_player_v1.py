@@ -3,9 +3,10 @@ import itertools
 import random
 import csv
 import os
-import matplotlib.pyplot as plt
+import time
 import numpy as np
 from compute_entropy import ComputeEntropy
+from histogram_table import HistogramStore, metric_scores
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Get the directory of the current script
@@ -13,9 +14,11 @@ word_list_path = os.path.join(SCRIPT_DIR, "wordlist_5.csv")
 word_freq_path = os.path.join(SCRIPT_DIR, "word_frequencies.txt")
 entropy_path = os.path.join(SCRIPT_DIR, "entropy_scores.csv")
 weights_path = os.path.join(SCRIPT_DIR, "optimal_weights.txt")
+allowed_words_path = os.path.join(SCRIPT_DIR, "allowed_words.txt")
 
 def load_data():
-    global WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy
+    global WORD_LIST, WORD_FREQUENCY, entropy_scores, w_base, w_positional, w_entropy, histogram_store
+    histogram_store = HistogramStore()
     with open(word_list_path) as f:
         WORD_LIST = [word.strip() for word in f if len(word.strip()) == 5]
     print('Loaded Word List')
@@ -83,12 +86,24 @@ def score_word(remaining_guesses, word, letter_frequencies, positional_frequenci
     
     return (w_base * base_score) + (w_positional * positional_score) * uniqueness_penalty + (w_entropy * entropy_score)
 
-def best_guess(words, remaining_guesses, entropy_scores, last_feedback=None, w_base=0.4, w_positional=0.4, w_entropy=0.2):
-    """Return the best word to guess based on scoring criteria."""
+def load_guess_pool(path=allowed_words_path):
+    """Load the full dictionary of allowed guesses, including words that can no longer be the answer."""
+    with open(path) as f:
+        return [word.strip() for word in f if len(word.strip()) == 5]
+
+def best_guess(words, remaining_guesses, entropy_scores, last_feedback=None, w_base=0.4, w_positional=0.4, w_entropy=0.2, guess_pool=None):
+    """Return the best word to guess based on scoring criteria.
+
+    With a guess_pool, later turns pick the highest-entropy word from the whole pool instead,
+    so an already-eliminated word can be played to split the remaining candidates.
+    """
+    if guess_pool is not None and remaining_guesses != 6:
+        return ComputeEntropy.best_entropy_guess(words, guess_pool)[0]
     letter_frequencies = get_letter_frequencies(words)
     positional_frequencies = compute_positional_frequencies(words)
     if remaining_guesses != 6:
-        entropy_scores = compute_entropy_instance.compute_entropy_scores(words, multi = 1)
+        # Later-turn states recur across games, so their histogram tables are cached on disk
+        entropy_scores = metric_scores(*histogram_store.get_or_compute(words))
     return max(words, key=lambda word: score_word(remaining_guesses, word, letter_frequencies, positional_frequencies, words, entropy_scores, w_base, w_positional, w_entropy)) 
 
 def filter_words(words, guess, result):
@@ -106,17 +121,27 @@ def filter_words(words, guess, result):
             new_words.append(word)
     return new_words
 
-def wordle_solver():
-    """Interactively solve Wordle by making and refining guesses based on user feedback."""
+def wordle_solver(start_time=None, guess_pool=None):
+    """Interactively solve Wordle by making and refining guesses based on user feedback.
+
+    If start_time (a time.perf_counter() value) is given, the time to the first prompt is reported.
+    If guess_pool is given, guesses after the first are searched over the whole pool.
+    """
     words = WORD_LIST.copy()
     remaining_guesses = 6
     while True:
-        guess = best_guess(words, remaining_guesses, entropy_scores)
+        guess = best_guess(words, remaining_guesses, entropy_scores, guess_pool=guess_pool)
         print(f"Try guessing: {guess}")
+        if start_time is not None:
+            print(f"Time to first prompt: {time.perf_counter() - start_time:.3f}s")
+            start_time = None
         user_input = input("Enter result (G = green, Y = yellow, B = black/gray) or 'N' for next guess: ").upper()
         
         if user_input == 'N':
-            words.remove(guess)
+            if guess in words:
+                words.remove(guess)
+            if guess_pool is not None:
+                guess_pool = [word for word in guess_pool if word != guess]
             remaining_guesses -= 1
             if not words:
                 print("No words left to suggest.")
@@ -0,0 +1,193 @@
+import os
+import queue
+import threading
+import tkinter as tk
+import numpy as np
+
+# Script version of the wordleish.ipynb front end. Suggestions are scored on a
+# background thread so the Tk main loop never blocks; progress and results are
+# handed back through a queue that the GUI polls with root.after.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WORDS_SOURCE = os.path.join(SCRIPT_DIR, "DataFiles", "words2.txt")
+WORDS_CACHE = os.path.join(SCRIPT_DIR, "DataFiles", "words2_5.npy")
+
+VOWELS = set("aeiouy")
+POLL_MS = 50
+CHUNK_SIZE = 500
+
+def load_word_list(source=WORDS_SOURCE, cache=WORDS_CACHE):
+    """Load the five-letter word list, using a compact .npy cache rebuilt only when the source changes."""
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(source):
+        return np.load(cache)
+
+    with open(source, "r") as f:
+        raw = f.read().replace('"', "").replace("\n", ",").split(",")
+    # dict.fromkeys de-duplicates in O(N) while keeping the original order
+    words = list(dict.fromkeys(w.strip().lower() for w in raw if len(w.strip()) == 5))
+    wordlist = np.array(words, dtype="<U5")
+    np.save(cache, wordlist)
+    return wordlist
+
+def filter_wordlist(wordlist, word_guess, result):
+    """Keep the words consistent with a guess and its result string (2 = right spot, 1 = in word, 0 = not in word)."""
+    keep = []
+    include = [c for c, r in zip(word_guess, result) if r == "1"]
+    exclude = [c for c, r in zip(word_guess, result) if r == "0"]
+    for word in wordlist:
+        if word == word_guess:
+            continue
+        if any(r == "2" and word[i] != word_guess[i] for i, r in enumerate(result)):
+            continue
+        if all(c in word for c in include) and not any(c in word for c in exclude):
+            keep.append(word)
+    return np.array(keep, dtype="<U5")
+
+def score_words(wordlist, word_guess="", w1=0.25, w2=1.0, cancel_event=None, progress=None):
+    """Score the remaining words by unique vowels and unused high-frequency letters.
+
+    Work is done in chunks; between chunks the cancel_event is checked (returns None when set)
+    and progress(done, total) is called.
+    """
+    if len(wordlist) == 0:
+        return np.empty(0)
+    letter_histo = {}
+    for word in wordlist:
+        for char in word:
+            letter_histo[char] = letter_histo.get(char, 0) + 1
+    max_letter = max(letter_histo.values())
+
+    vowel_unique_count = np.empty(len(wordlist))
+    letter_score = np.empty(len(wordlist))
+    for start in range(0, len(wordlist), CHUNK_SIZE):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        for i in range(start, min(start + CHUNK_SIZE, len(wordlist))):
+            letters = set(wordlist[i])
+            vowel_unique_count[i] = len(letters & VOWELS)
+            letter_score[i] = sum(letter_histo[c] for c in letters if c not in word_guess) / max_letter
+        if progress is not None:
+            progress(min(start + CHUNK_SIZE, len(wordlist)), len(wordlist))
+
+    max_vowel_cnt = vowel_unique_count.max() or 1
+    return w1 * (vowel_unique_count / max_vowel_cnt) + w2 * letter_score
+
+class SuggestionWorker:
+    """Runs score_words on a background thread; starting a new job cancels the previous one."""
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self.cancel_event = None
+        self.job_id = 0
+
+    def submit(self, wordlist, word_guess, w1, w2):
+        """Cancel any running job and start scoring wordlist in the background."""
+        self.cancel()
+        self.job_id += 1
+        job_id, cancel_event = self.job_id, threading.Event()
+        self.cancel_event = cancel_event
+
+        def progress(done, total):
+            self.results.put((job_id, "progress", (done, total)))
+
+        def run():
+            scores = score_words(wordlist, word_guess, w1, w2, cancel_event, progress)
+            if scores is None:
+                self.results.put((job_id, "cancelled", None))
+            else:
+                self.results.put((job_id, "done", scores))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def cancel(self):
+        """Signal the running job, if any, to stop at its next chunk boundary."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+class WordleishApp:
+    """Tk front end: enter a guess and its result, get suggestions without freezing the window."""
+
+    def __init__(self, root, w1=0.25, w2=1.0):
+        self.root = root
+        self.w1, self.w2 = w1, w2
+        self.wordlist = load_word_list()
+        self.guess_list = []
+        self.last_guess = ""
+        self.worker = SuggestionWorker()
+
+        root.title("Wordle_Py")
+        root.geometry("600x400")
+        self.word_ent_var = tk.StringVar()
+        self.results_var = tk.StringVar()
+        self.status_var = tk.StringVar(value=f"{len(self.wordlist)} words loaded")
+        # Typing a new guess makes the running suggestion stale, so cancel it
+        self.word_ent_var.trace_add("write", lambda *_: self.worker.cancel())
+
+        tk.Label(root, text="Word Entry", font=("calibre", 10, "bold")).grid(row=0, column=0)
+        tk.Entry(root, textvariable=self.word_ent_var, font=("calibre", 10, "normal")).grid(row=0, column=1)
+        tk.Button(root, text="Submit", command=self.submit_guess).grid(row=0, column=2)
+        tk.Label(root, text="Results", font=("calibre", 10, "bold")).grid(row=1, column=0)
+        tk.Entry(root, textvariable=self.results_var, font=("calibre", 10, "normal")).grid(row=1, column=1)
+        tk.Label(root, text="Suggestion", font=("calibre", 10, "bold")).grid(row=2, column=0)
+        self.suggest_list = tk.Text(root, width=17, height=5)
+        self.suggest_list.grid(row=2, column=1)
+        tk.Button(root, text="Suggest", command=self.suggest).grid(row=2, column=2)
+        tk.Label(root, textvariable=self.status_var).grid(row=3, column=0, columnspan=3)
+        self.entry_list = tk.Text(root, width=15, height=6)
+        self.entry_list.grid(row=0, column=3, rowspan=4)
+
+        root.after(POLL_MS, self.poll_worker)
+
+    def submit_guess(self):
+        """Apply the entered guess and result to the word list, then start a suggestion."""
+        word_guess = self.word_ent_var.get().strip().lower()
+        result = self.results_var.get().replace(" ", "")
+        if word_guess in self.guess_list or len(word_guess) != 5 or len(result) != 5:
+            self.status_var.set("Enter a new five-letter guess and a five-digit result (0/1/2).")
+            return
+        self.guess_list.append(word_guess)
+        self.entry_list.insert("end", f"{word_guess} {result}\n")
+        self.wordlist = filter_wordlist(self.wordlist, word_guess, result)
+        self.last_guess = word_guess
+        self.word_ent_var.set("")
+        self.results_var.set("")
+        self.suggest()
+
+    def suggest(self):
+        """Score the remaining words in the background."""
+        self.status_var.set(f"Scoring {len(self.wordlist)} words...")
+        self.worker.submit(self.wordlist, self.last_guess, self.w1, self.w2)
+
+    def poll_worker(self):
+        """Drain worker messages on the Tk thread, ignoring any from cancelled jobs."""
+        try:
+            while True:
+                job_id, kind, payload = self.worker.results.get_nowait()
+                if job_id != self.worker.job_id:
+                    continue
+                if kind == "progress":
+                    done, total = payload
+                    self.status_var.set(f"Scoring {done}/{total} words...")
+                elif kind == "cancelled":
+                    # Cancelled without a newer job (e.g. by typing), so nothing else will update the status
+                    self.status_var.set(f"{len(self.wordlist)} words remaining; suggestion cancelled")
+                else:
+                    self.show_suggestions(payload)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_worker)
+
+    def show_suggestions(self, scores):
+        """Display the best-scoring words."""
+        self.suggest_list.delete("1.0", "end")
+        if len(scores) == 0:
+            self.status_var.set("No words left. Check input.")
+            return
+        top = np.argsort(scores)[::-1][:5]
+        self.suggest_list.insert("end", "\n".join(self.wordlist[top]))
+        self.status_var.set(f"{len(self.wordlist)} words remaining")
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    WordleishApp(root)
+    root.mainloop()